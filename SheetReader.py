@@ -1,98 +1,701 @@
-import gspread
-from google.oauth2.service_account import Credentials
-import pandas as pd
+import time
 
-scopes = [
-    'https://www.googleapis.com/auth/spreadsheets',
-    'https://www.googleapis.com/auth/drive'
-]
+from gspread.utils import DateTimeOption, ValueRenderOption, numericise_all, rowcol_to_a1
+from concurrency import ReadWriteLock, SingleFlight
+from file_links import FileLinkIndex
+from google_session import authorized_client
+import metrics
+import profiling
+from request_scheduler import default_scheduler
+from record_store import RecordStore
+from sheet_errors import AssignmentNotFoundError, DuplicateAssignmentError, SheetError
+from sheet_sources import SheetSource
+from snapshot_store import load_snapshot, save_snapshot
+
+# Projected reads take numbers unformatted but dates as formatted text, the form get_all_records
+# gives them, so a snapshot holds the same kind of value whichever path filled it
+RENDER_OPTIONS = {'value_render_option': ValueRenderOption.unformatted,
+                  'date_time_render_option': DateTimeOption.formatted_string}
+
+# Seconds a fetched snapshot is trusted before we ask Drive whether the sheet changed
+DEFAULT_CACHE_TTL = 30
+
+# Rows per values.batchGet when streaming a sheet into the dropdown
+STREAM_CHUNK_ROWS = 500
+
+# Columns B:F, in the order update_record writes them
+WRITE_COLUMNS = ['Description', 'Due Date', 'Progress', 'Assignee Name', 'File Path']
+WRITE_FIRST_COLUMN = 'B'
 
 class SheetReader:
-    def __init__(self, credentials_path, spreadsheet_id):
+    """Cached, projected access to one worksheet, safe to share between threads"""
+    @metrics.timed('sheet.connect')
+    @profiling.profiled('sheet-reader')
+    def __init__(self, credentials_path, spreadsheet_id, cache_ttl=DEFAULT_CACHE_TTL, use_disk_cache=True,
+                 worksheet=None, client=None, spreadsheet=None, scheduler=None):
         self.credentials_path = credentials_path
         self.spreadsheet_id = spreadsheet_id
-        self.authenticate()
-        self.get_spreadsheet()
-        self.worksheet = self.spreadsheet.get_worksheet(0)
+        self.cache_ttl = cache_ttl
+        self.use_disk_cache = use_disk_cache
+        self.worksheet_title = worksheet
+        # Every request goes through one budget, retry policy and circuit breaker per process
+        self.scheduler = scheduler or default_scheduler()
+        # MultiSheetReader passes a shared client and spreadsheet so tabs don't re-authenticate
+        self.client = client
+        self._spreadsheet = spreadsheet
+        self._worksheet = None
+        self.snapshot_key = SheetSource(spreadsheet_id, worksheet).snapshot_key
+        self._lock = ReadWriteLock()
+        self._flights = SingleFlight()
         self.records = None
-        self.get_records()
+        self._index = {}
+        self.duplicates = set()
+        self.file_links = FileLinkIndex()
+        self._checked_at = 0.0
+        self._modified_time = None
+        # Label saved with the disk snapshot, shown until the spreadsheet can be opened
+        self._saved_label = None
+        # Header row and column letters, read once and reused for projected reads
+        self.header = None
+        self._column_letters = {}
+        # Snapshot positions whose non-Assignment cells predate the last projected refresh
+        self._unverified = set()
+        # Snapshot the last poll_changes() reported, so it only reports a new one
+        self._polled_records = None
+        # Loaded before anything touches the network, so an offline start still has rows to show
+        if self.use_disk_cache:
+            self.load_disk_snapshot()
+        try:
+            self.connect()
+            # Without a snapshot the first read downloads the sheet, so iter_assignment_chunks can stream it
+            if self.has_snapshot():
+                self.revalidate()
+        except SheetError as e:
+            # A snapshot from disk is still worth serving; without one there is nothing to show
+            if not self.has_snapshot():
+                raise
+            print(f"Using saved snapshot, spreadsheet unavailable: {e}")
+
+    def _call(self, fn, *args, **kwargs):
+        return self.scheduler.call(fn, *args, **kwargs)
 
     def authenticate(self):
-        try:
-            credentials = Credentials.from_service_account_file(self.credentials_path, scopes=scopes)
-            self.client = gspread.authorize(credentials)
-        except Exception as e:
-            print(f"Error during authentication: {e}")
-    
+        self.client = self._call(authorized_client, self.credentials_path)
+
     def get_spreadsheet(self):
-        try:
-            self.spreadsheet = self.client.open_by_key(self.spreadsheet_id)
-        except Exception as e:
-            print(f"Error accessing spreadsheet: {e}")
-    
-    def get_records(self):
-        try:
-            records = self.worksheet.get_all_records()
-            self.records = pd.DataFrame(records)
+        self._spreadsheet = self._call(self.client.open_by_key, self.spreadsheet_id)
+
+    def connect(self):
+        """Open the worksheet, authenticating first if needed; concurrent callers share one attempt"""
+        return self._flights.do('connect', self._connect)
+
+    def _connect(self):
+        if self._worksheet is not None:
+            return self._worksheet
+        if self.client is None:
+            self.authenticate()
+        if self._spreadsheet is None:
+            self.get_spreadsheet()
+        if self.worksheet_title is None:
+            self._worksheet = self._call(self._spreadsheet.get_worksheet, 0)
+        else:
+            self._worksheet = self._call(self._spreadsheet.worksheet, self.worksheet_title)
+        return self._worksheet
+
+    @property
+    def spreadsheet(self):
+        if self._spreadsheet is None:
+            self.connect()
+        return self._spreadsheet
+
+    @property
+    def worksheet(self):
+        # Opened on first use when the constructor couldn't reach Google
+        if self._worksheet is None:
+            self.connect()
+        return self._worksheet
+
+    @property
+    def label(self):
+        """Name shown for this worksheet when several are loaded together"""
+        if self.worksheet_title:
+            return self.worksheet_title
+        if self._spreadsheet is None and self.has_snapshot():
+            # Offline: the label the snapshot was saved under, as load_cached_records names it
+            return self._saved_label or self.spreadsheet_id
+        return self.spreadsheet.title
+
+    def has_snapshot(self):
+        return self.records is not None
+
+    def get_modified_time(self):
+        """Return the spreadsheet's Drive modifiedTime (one small metadata call)"""
+        return self._call(self.spreadsheet.get_lastUpdateTime)
+
+    def is_stale(self):
+        """Check whether the cached snapshot needs to be refetched"""
+        return self._staleness()[0]
+
+    def _staleness(self):
+        """Return (stale, modifiedTime), where modifiedTime is None unless Drive was asked"""
+        with self._lock.read():
+            has_records = self.records is not None
+            within_ttl = time.monotonic() - self._checked_at < self.cache_ttl
+            known_modified_time = self._modified_time
+        if not has_records:
+            metrics.record_cache(False)
+            return True, None
+        if within_ttl:
+            metrics.record_cache(True)
+            return False, None
+
+        modified_time = self.get_modified_time()
+        if modified_time is None or modified_time != known_modified_time:
+            metrics.record_cache(False)
+            return True, modified_time
+        with self._lock.write():
+            self._checked_at = time.monotonic()
+        metrics.record_cache(True)
+        return False, modified_time
+
+    def invalidate(self):
+        """Drop the cached snapshot so the next read refetches it"""
+        with self._lock.write():
+            self.records = None
+            self._index = {}
+            self.duplicates = set()
+            self.file_links = FileLinkIndex()
+            self._modified_time = None
+            self._checked_at = 0.0
+            self.header = None
+            self._column_letters = {}
+            self._unverified = set()
+
+    def refresh(self):
+        """Force a fresh snapshot from the spreadsheet, serving the current one until it arrives"""
+        return self._flights.do('refresh', self._get_records, True)
+
+    def load_disk_snapshot(self):
+        """Seed the cache from the last snapshot saved for this spreadsheet, adopted as already expired"""
+        records, modified_time, label = load_snapshot(self.snapshot_key, include_label=True)
+        if records is None:
+            return False
+        self._saved_label = label
+        with self._lock.write():
+            self._install(RecordStore(records), modified_time)
+            self._checked_at = 0.0
+        return True
+
+    def _install(self, store, modified_time, unverified=()):
+        """Swap in a new snapshot; the caller holds the write lock"""
+        self.records = store
+        self._build_index()
+        self._unverified = set(unverified)
+        self._modified_time = modified_time
+        self._checked_at = time.monotonic()
+
+    def load_header(self):
+        """Read the header row once and map each column name to its letter"""
+        return self._load_header()[0]
+
+    def _load_header(self):
+        """Return (header, column letters), reading them on first use"""
+        with self._lock.read():
+            header, letters = self.header, self._column_letters
+        if header is None:
+            header, letters = self._flights.do('header', self._fetch_header)
+        return header, letters
+
+    def _fetch_header(self):
+        with self._lock.read():
+            if self.header is not None:
+                return self.header, self._column_letters
+        header = self._call(self.worksheet.row_values, 1)
+        letters = {column: rowcol_to_a1(1, number)[:-1] for number, column in enumerate(header, start=1)}
+        with self._lock.write():
+            self.header = header
+            self._column_letters = letters
+        return header, letters
+
+    def fetch_columns(self, columns):
+        """Download only the given columns (below the header) in one values.batchGet, padded to one length"""
+        _, letters = self._load_header()
+        ranges = []
+        for column in columns:
+            letter = letters[column]
+            ranges.append(f"{letter}2:{letter}")
+        value_ranges = self._call(self.worksheet.batch_get, ranges, major_dimension='COLUMNS', **RENDER_OPTIONS)
+        values = {column: list(value_range[0]) if value_range else []
+                  for column, value_range in zip(columns, value_ranges)}
+        length = max((len(column_values) for column_values in values.values()), default=0)
+        for column_values in values.values():
+            column_values.extend([''] * (length - len(column_values)))
+        return values
+
+    def fetch_rows(self, positions):
+        """Download whole rows for the given snapshot positions in one values.batchGet"""
+        header, letters = self._load_header()
+        if not header:
+            return {}
+        last = letters[header[-1]]
+        ranges = [f"A{position + 2}:{last}{position + 2}" for position in positions]
+        value_ranges = self._call(self.worksheet.batch_get, ranges, **RENDER_OPTIONS)
+        rows = {}
+        for position, value_range in zip(positions, value_ranges):
+            cells = numericise_all(list(value_range[0]) if value_range else [])
+            cells.extend([''] * (len(header) - len(cells)))
+            rows[position] = dict(zip(header, cells))
+        return rows
+
+    @metrics.timed('sheet.revalidate')
+    def revalidate(self):
+        """Bring the assignment list up to date, fetching just the Assignment column when it changed"""
+        if self.records is None:
+            return self.get_records()
+        return self._flights.do('revalidate', self._revalidate)
+
+    def _revalidate(self):
+        stale, modified_time = self._staleness()
+        if not stale:
             return self.records
-        except Exception as e:
-            print(f"Error fetching records: {e}")
-            return []
-        
-    def get_assignments(self):
+        if self.records is None:
+            return self.get_records()
+        return self._refresh_names(modified_time)
+
+    def _refresh_names(self, modified_time=None):
+        """Refetch the Assignment column, keeping the cached cells of rows that keep their name"""
+        modified_time = modified_time or self.get_modified_time()
+        header, _ = self._load_header()
+        names = self.fetch_columns(['Assignment'])['Assignment']
+        with self._lock.read():
+            old_records = self.records
+            rows = [old_records.row(self._index[name]) if name in self._index else {'Assignment': name}
+                    for name in names]
+        store = RecordStore(rows, header)
+        # Saved without a modified time so the next launch rechecks the cells it carries
+        saved = store.to_records() if self.use_disk_cache else None
+        with self._lock.write():
+            if self.records is not old_records and self.records is not None:
+                # A full download landed meanwhile and is at least as new
+                return self.records
+            self._install(store, modified_time, range(len(store)))
+        if saved is not None:
+            save_snapshot(self.snapshot_key, saved, None, label=self.label)
+        return store
+
+    @metrics.timed('sheet.poll_changes')
+    def poll_changes(self, modified_time=None):
+        """Return the assignment list if it changed since the last poll, else None"""
+        return self._flights.do('poll', self._poll_changes, modified_time)
+
+    def _poll_changes(self, modified_time):
+        self._check_now(modified_time)
+        with self._lock.write():
+            if self.records is self._polled_records:
+                return None
+            self._polled_records = self.records
+            if 'Assignment' not in self.records:
+                return []
+            return list(self.records['Assignment'])
+
+    def _check_now(self, modified_time=None):
+        """Compare Drive's modifiedTime with the snapshot's, ignoring the TTL, and refetch the names if it changed"""
+        with self._lock.read():
+            records, known_modified_time = self.records, self._modified_time
+        if records is None:
+            self.get_records()
+            return
+        modified_time = modified_time or self.get_modified_time()
+        if modified_time is not None and modified_time == known_modified_time:
+            with self._lock.write():
+                self._checked_at = time.monotonic()
+        else:
+            self._flights.do(('names', modified_time), self._refresh_names, modified_time)
+
+    def _revalidate_for_write(self):
+        """Make sure snapshot positions match the sheet's rows before writing to them"""
+        self._flights.do('write-check', self._check_now)
+
+    def ensure_rows(self, positions, records=None):
+        """Reread any of the given rows whose cached cells may be outdated"""
+        with self._lock.read():
+            if records is None:
+                records = self.records
+            if self.records is not records:
+                return
+            missing = sorted(position for position in positions if position in self._unverified)
+        metrics.record_cache(not missing)
+        if not missing:
+            return
+        self._flights.do(('rows', tuple(missing)), self._refresh_rows, records, missing)
+
+    def _refresh_rows(self, records, positions):
+        with self._lock.read():
+            if self.records is not records:
+                return
+            positions = [position for position in positions if position in self._unverified]
+        if not positions:
+            return
+        rows = self.fetch_rows(positions)
+        with self._lock.write():
+            if self.records is not records:
+                return
+            for position, row in rows.items():
+                for column, value in row.items():
+                    if column != 'Assignment':
+                        records.set(position, column, value)
+                if 'File Path' in row:
+                    self.file_links.link(row['File Path'], records['Assignment'][position])
+                self._unverified.discard(position)
+
+    def _read_row(self, assignment):
+        """Return (position, row) for an assignment with every cell current"""
+        while True:
+            with self._lock.read():
+                records = self.records
+                position = self._find_position(assignment)
+            self.ensure_rows([position], records)
+            with self._lock.read():
+                if self.records is records:
+                    return position, records.row(position)
+
+    def iter_assignment_chunks(self, chunk_size=STREAM_CHUNK_ROWS):
+        """Download the assignment list in row blocks, yielding (names, loaded, total) after each"""
+        # Timed per block: the caller may do anything between blocks, on any thread
+        with metrics.operation('sheet.stream_start'):
+            stale, modified_time = self._staleness()
+            if stale:
+                with self._lock.read():
+                    old_records = self.records
+                    old_index = self._index
+                full = old_records is None
+                modified_time = modified_time or self.get_modified_time()
+                header, letters = self._load_header()
+        if not stale:
+            with self._lock.read():
+                names = list(self.records['Assignment'])
+            yield names, len(names), len(names)
+            return names
+
+        if full:
+            first, last = 'A', letters[header[-1]]
+        else:
+            first = last = letters['Assignment']
+        total = max(self.worksheet.row_count - 1, 0)
+
+        store = RecordStore(columns=header)
+        # Blank rows are only kept once a later row shows they aren't trailing
+        blank_rows = 0
+        start = 2
+        while start <= total + 1:
+            end = min(start + chunk_size - 1, total + 1)
+            with metrics.operation('sheet.stream_block'):
+                value_ranges = self._call(self.worksheet.batch_get, [f"{first}{start}:{last}{end}"], **RENDER_OPTIONS)
+            rows = value_ranges[0] if value_ranges else []
+            names = []
+            # Rows kept from the old snapshot are copied under the lock, as saves may be patching them
+            with self._lock.read():
+                for cells in rows:
+                    if not any(cell != '' for cell in cells):
+                        blank_rows += 1
+                        continue
+                    for _ in range(blank_rows):
+                        store.append({})
+                        names.append('')
+                    blank_rows = 0
+                    if full:
+                        cells = numericise_all(list(cells))
+                        record = dict(zip(header, cells))
+                    elif cells[0] in old_index:
+                        record = old_records.row(old_index[cells[0]])
+                    else:
+                        record = {'Assignment': cells[0]}
+                    store.append(record)
+                    names.append(store['Assignment'][-1])
+            # The API drops empty rows at the end of each block
+            blank_rows += (end - start + 1) - len(rows)
+            yield names, len(store), max(total, len(store))
+            start = end + 1
+
+        saved = store.to_records() if self.use_disk_cache else None
+        with self._lock.write():
+            self._install(store, modified_time, () if full else range(len(store)))
+        if saved is not None:
+            save_snapshot(self.snapshot_key, saved, modified_time if full else None, label=self.label)
+        return list(store['Assignment'])
+
+    @metrics.timed('sheet.get_records')
+    def get_records(self):
+        """Return a snapshot with every cell current, downloading the whole sheet if needed"""
+        return self._flights.do('records', self._get_records)
+
+    def _get_records(self, force=False):
+        with self._lock.read():
+            unverified = bool(self._unverified)
+        modified_time = None
+        if not unverified and not force:
+            stale, modified_time = self._staleness()
+            if not stale:
+                return self.records
+        # Read the modified time before downloading so an edit racing the download is caught next time
+        modified_time = modified_time or self.get_modified_time()
+        records = self._call(self.worksheet.get_all_records)
+        store = RecordStore(records)
+        with self._lock.write():
+            self._install(store, modified_time)
+        if self.use_disk_cache:
+            save_snapshot(self.snapshot_key, records, modified_time, label=self.label)
+        return store
+
+    @metrics.timed('sheet.export_records')
+    def export_records(self):
+        """Return every row as a dict with every cell current"""
+        records = self.get_records()
+        with self._lock.read():
+            return records.to_records()
+
+    @metrics.timed('sheet.to_dataframe')
+    def to_dataframe(self):
+        """Return the current snapshot as a pandas DataFrame (needs the analytics extra)"""
         self.get_records()
-        try:
+        with self._lock.read():
+            return self.records.to_dataframe()
+
+    @metrics.timed('sheet.get_assignments')
+    def get_assignments(self):
+        self.revalidate()
+        with self._lock.read():
+            if 'Assignment' not in self.records:
+                return []
             return list(self.records['Assignment'])
-        except Exception as e:
-            print(f"Error fetching assignments: {e}")
-            return []
-    
+
+    def _build_index(self):
+        """Map each assignment name to its position, and each linked file to its assignment"""
+        self._index = {}
+        self.duplicates = set()
+        self.file_links = FileLinkIndex()
+        if 'Assignment' not in self.records:
+            return
+        if 'File Path' in self.records:
+            self.file_links = FileLinkIndex(self.records['Assignment'], self.records['File Path'])
+        for position, assignment in enumerate(self.records['Assignment']):
+            if assignment in self._index:
+                self.duplicates.add(assignment)
+            else:
+                self._index[assignment] = position
+        if self.duplicates:
+            names = ', '.join(str(name) for name in self.duplicates)
+            print(f"Warning: duplicate assignment names in sheet: {names}")
+
+    def _find_position(self, assignment):
+        """Return the snapshot position for an assignment, refusing ambiguous names"""
+        if assignment in self.duplicates:
+            raise DuplicateAssignmentError(f"'{assignment}' appears more than once in the sheet")
+        if assignment not in self._index:
+            raise AssignmentNotFoundError(f"'{assignment}' not found in the sheet")
+        return self._index[assignment]
+
+    @metrics.timed('sheet.has_assignment')
+    def has_assignment(self, assignment):
+        self.revalidate()
+        with self._lock.read():
+            return assignment in self._index
+
+    @metrics.timed('sheet.get_record')
+    def get_record(self, assignment):
+        """Return the full row for an assignment as a dict keyed by column header"""
+        self.revalidate()
+        return self._read_row(assignment)[1]
+
+    def cached_record(self, assignment):
+        """Return the snapshot row for an assignment without touching the network, or None"""
+        with self._lock.read():
+            position = self._index.get(assignment)
+            if position is None or self.records is None:
+                return None
+            return self.records.row(position)
+
+    def linked_assignment(self, file_path):
+        """Return the assignment a file is linked to in the snapshot, or None"""
+        with self._lock.read():
+            return self.file_links.lookup(file_path)
+
+    def link_file(self, file_path, assignment):
+        """Point a file at an assignment in the snapshot's link index, ahead of the save that writes it"""
+        with self._lock.write():
+            self.file_links.link(file_path, assignment)
+
+    @metrics.timed('sheet.get_field')
+    def _get_field(self, assignment, column):
+        self.revalidate()
+        return self._read_row(assignment)[1][column]
+
     def get_description(self, assignment):
-        self.get_records()
-        try:
-            return self.records.loc[self.records['Assignment'] == assignment, 'Description'].values[0]
-        except Exception as e:
-            print(f"Error fetching description for {assignment}: {e}")
-            return None
+        return self._get_field(assignment, 'Description')
 
     def get_due_date(self, assignment):
-        self.get_records()
-        try:
-            return self.records.loc[self.records['Assignment'] == assignment, 'Due Date'].values[0]
-        except Exception as e:
-            print(f"Error fetching due date for {assignment}: {e}")
-            return None
-    
+        return self._get_field(assignment, 'Due Date')
+
     def get_progress(self, assignment):
-        self.get_records()
-        try:
-            return self.records.loc[self.records['Assignment'] == assignment, 'Progress'].values[0]
-        except Exception as e:
-            print(f"Error fetching progress for {assignment}: {e}")
-            return None
-    
+        return self._get_field(assignment, 'Progress')
+
     def get_assignee(self, assignment):
-        self.get_records()
-        try:
-            return self.records.loc[self.records['Assignment'] == assignment, 'Assignee Name'].values[0]
-        except Exception as e:
-            print(f"Error fetching assignee for {assignment}: {e}")
-            return None
+        return self._get_field(assignment, 'Assignee Name')
+
+    def _prepare_row(self, assignment, file_path=None, description=None, due_date=None, progress=None, assignee=None):
+        """Resolve an edit to its snapshot position and the cells it actually changes"""
+        # Compare against the cached row instead of refetching per field
+        position, record = self._read_row(assignment)
+        return position, self._row_changes(record, file_path, description, due_date, progress, assignee)
 
+    @staticmethod
+    def _row_changes(record, file_path, description, due_date, progress, assignee):
+        values = [description, due_date, progress, assignee]
+        changes = {}
+        for column, value in zip(WRITE_COLUMNS, values):
+            if value and str(value) != str(record.get(column, '')):
+                changes[column] = value
+        if file_path is not None and str(file_path) != str(record.get('File Path', '')):
+            changes['File Path'] = file_path
+        return changes
+
+    def _matches_snapshot(self, assignment, file_path=None, description=None, due_date=None, progress=None,
+                          assignee=None):
+        """Whether an edit changes nothing in its verified cached row, so it needs no check and no write"""
+        with self._lock.read():
+            position = self._index.get(assignment)
+            if position is None or assignment in self.duplicates or position in self._unverified:
+                return False
+            record = self.records.row(position)
+        return not self._row_changes(record, file_path, description, due_date, progress, assignee)
+
+    @staticmethod
+    def _change_ranges(position, changes):
+        """Turn one row's changed cells into values.update entries, one per run of adjacent columns"""
+        index = position + 2
+        ranges = []
+        run = []
+        for offset, column in enumerate(WRITE_COLUMNS + [None]):
+            if column in changes:
+                run.append((offset, changes[column]))
+                continue
+            if run:
+                first = chr(ord(WRITE_FIRST_COLUMN) + run[0][0])
+                last = chr(ord(WRITE_FIRST_COLUMN) + run[-1][0])
+                ranges.append({'range': f"{first}{index}:{last}{index}", 'values': [[value for _, value in run]]})
+                run = []
+        return ranges
+
+    def _apply_rows(self, written):
+        """Keep the cached snapshot in step with (assignment, changed cells) pairs we just wrote"""
+        with self._lock.write():
+            for assignment, changes in written:
+                position = self._index.get(assignment)
+                if position is None or assignment in self.duplicates:
+                    continue
+                for column, value in changes.items():
+                    self.records.set(position, column, value)
+                if 'File Path' in changes:
+                    self.file_links.link(changes['File Path'], assignment)
+
+    @metrics.timed('sheet.update_record')
     def update_record(self, assignment, file_path, description=None, due_date=None, progress=None, assignee=None):
-        self.get_records()
-        try:
-            if not description:
-                description = self.get_description(assignment)
-            if not due_date:
-                due_date = self.get_due_date(assignment)
-            if not progress:
-                progress = self.get_progress(assignment)
-            if not assignee:
-                assignee = self.get_assignee(assignment)
-
-            index = self.records[self.records['Assignment'] == assignment].index[0] + 2
-            self.worksheet.update(f"B{index}:F{index}", [[description, due_date, progress, assignee, file_path]])
-            print(f"Record for {assignment} updated successfully.")
-        except Exception as e:
-            print(f"Error updating record for {assignment}: {e}")
\ No newline at end of file
+        """Write the cells of an assignment's row that differ from the sheet; no request if none do"""
+        if self._matches_snapshot(assignment, file_path, description, due_date, progress, assignee):
+            print(f"Record for {assignment} unchanged, nothing to write.")
+            return
+        self._revalidate_for_write()
+        position, changes = self._prepare_row(assignment, file_path, description, due_date, progress, assignee)
+        ranges = self._change_ranges(position, changes)
+        if not ranges:
+            print(f"Record for {assignment} unchanged, nothing to write.")
+            return
+        if len(ranges) == 1:
+            self._call(self.worksheet.update, ranges[0]['range'], ranges[0]['values'])
+        else:
+            self._call(self.worksheet.batch_update, ranges)
+        self._apply_rows([(assignment, changes)])
+        print(f"Record for {assignment} updated successfully.")
+
+    @metrics.timed('sheet.update_records')
+    def update_records(self, updates):
+        """Write many row edits in one values.batchUpdate; returns {assignment: written}"""
+        results = {}
+        # Edits that match their cached rows need neither the freshness check nor a write
+        pending = []
+        for update in updates:
+            if self._matches_snapshot(**update):
+                results[update.get('assignment')] = True
+            else:
+                pending.append(update)
+        if not pending:
+            return results
+        updates = pending
+
+        self._revalidate_for_write()
+        # Reread every unverified row the batch touches in one request rather than one per row
+        with self._lock.read():
+            records = self.records
+            positions = [self._index[update.get('assignment')] for update in updates
+                         if update.get('assignment') in self._index]
+        self.ensure_rows(positions, records)
+        data = []
+        prepared = []
+        for update in updates:
+            assignment = update.get('assignment')
+            try:
+                position, changes = self._prepare_row(**update)
+            except (AssignmentNotFoundError, DuplicateAssignmentError) as e:
+                print(f"Error preparing record for {assignment}: {e}")
+                results[assignment] = False
+                continue
+            data.extend(self._change_ranges(position, changes))
+            prepared.append((assignment, changes))
+
+        if not data:
+            for assignment, _ in prepared:
+                results[assignment] = True
+            return results
+
+        self._call(self.worksheet.batch_update, data)
+        self._apply_rows(prepared)
+        for assignment, _ in prepared:
+            results[assignment] = True
+        print(f"Batch of {len(prepared)} records updated successfully.")
+        return results
+
+    def batch(self):
+        """Collect update_record calls and flush them as one request on exit"""
+        return BatchUpdate(self)
+
+class BatchUpdate:
+    """Context manager that queues row edits for SheetReader.update_records"""
+    def __init__(self, sheet_reader):
+        self.sheet_reader = sheet_reader
+        self.updates = []
+        self.results = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Don't send a half-built batch if the caller raised
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def update_record(self, assignment, file_path, description=None, due_date=None, progress=None, assignee=None):
+        self.updates.append({
+            'assignment': assignment,
+            'file_path': file_path,
+            'description': description,
+            'due_date': due_date,
+            'progress': progress,
+            'assignee': assignee,
+        })
+
+    def flush(self):
+        if self.updates:
+            self.results.update(self.sheet_reader.update_records(self.updates))
+            self.updates = []
+        return self.results
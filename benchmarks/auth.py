@@ -0,0 +1,95 @@
+"""Connection latency benchmark for Assignment Tracker.
+
+Starts fresh Python processes that connect to the configured spreadsheet
+and reports, in milliseconds:
+
+- token:          getting an access token (JWT signing and exchange, or the cache)
+- first_request:  the first Sheets/Drive call on the new session
+- second_request: a repeat call, reusing the keep-alive connection
+- total:          authorizing through the second request
+
+Each run is done twice: "cold" with an empty token cache, as every launch
+used to be, and "warm" with the token cached by the cold run. The
+difference is the latency the token cache saves on each launch:
+
+    python3 benchmarks/auth.py --runs 5 > auth.json
+
+Requires a configured ~/.assignment_tracker. Uses a temporary token cache,
+so the app's own cache is left alone.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_DIR = os.path.expanduser("~/.assignment_tracker")
+STEPS = ['token', 'first_request', 'second_request', 'total']
+
+def child(credentials_path, sheet_id, token_cache_path):
+    """Connect once and print step timings as JSON"""
+    sys.path.insert(0, ROOT)
+    import google_session
+    from sheet_sources import parse_sources
+
+    spreadsheet_id = parse_sources(sheet_id)[0].spreadsheet_id
+    started = time.perf_counter()
+    client = google_session.authorized_client(credentials_path, token_cache_path)
+    authorized = time.perf_counter()
+    spreadsheet = client.open_by_key(spreadsheet_id)
+    first = time.perf_counter()
+    spreadsheet.get_lastUpdateTime()
+    second = time.perf_counter()
+    print(json.dumps({
+        'token_source': google_session.timings.get('token_source'),
+        'token': google_session.timings.get('token_ms'),
+        'first_request': (first - authorized) * 1000,
+        'second_request': (second - first) * 1000,
+        'total': (second - started) * 1000,
+    }))
+
+def run_child(token_cache_path):
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", token_cache_path],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def summarize(samples):
+    return {step: round(statistics.median(sample[step] for sample in samples), 1) for step in STEPS}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", metavar="TOKEN_CACHE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(CONFIG_DIR, ".env"))
+    credentials_path = os.path.join(CONFIG_DIR, "credentials.json")
+    if args.child:
+        child(credentials_path, os.getenv("SHEET_ID"), args.child)
+        return
+
+    cold, warm = [], []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        token_cache_path = os.path.join(temp_dir, "token_cache.json")
+        for _ in range(args.runs):
+            if os.path.exists(token_cache_path):
+                os.remove(token_cache_path)
+            cold.append(run_child(token_cache_path))
+            warm.append(run_child(token_cache_path))
+
+    cold_summary, warm_summary = summarize(cold), summarize(warm)
+    print(json.dumps({
+        'runs': args.runs,
+        'cold': cold_summary,
+        'warm': warm_summary,
+        'saved_ms': round(cold_summary['total'] - warm_summary['total'], 1),
+        'warm_token_sources': sorted({sample['token_source'] for sample in warm}),
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
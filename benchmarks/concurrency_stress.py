@@ -0,0 +1,203 @@
+"""SheetReader thread-safety stress run against the in-process fake backend.
+
+Starts dozens of threads at once on one SheetReader and checks that
+concurrent requests for the same data are merged into a single API call
+and that every thread gets the right answer:
+
+- revalidate:  the sheet changed; every thread asks for the assignment list
+- detail:      every thread loads the same unverified row
+- download:    every thread asks for the full, verified snapshot
+- writes:      every thread saves a different assignment
+- mixed:       lookups, saves and forced refreshes interleaved for a while
+
+The first four have an exact expected set of API calls; mixed checks
+that no lookup sees another assignment's row or fails, and that every
+save reached the sheet. Exits 1 on any mismatch:
+
+    python3 benchmarks/concurrency_stress.py --threads 50 --rows 10000
+
+Needs gspread installed, but no credentials or network access.
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_sheets import FakeBackend
+from request_scheduler import CircuitBreaker, RequestScheduler
+from SheetReader import SheetReader
+
+# Seconds of fake latency per call, long enough that every thread arrives while the first call is in flight
+LATENCY = 0.05
+
+def make_scheduler():
+    # No per-minute budget: the fake has no quota, and waiting on it would hide overlaps
+    return RequestScheduler(requests_per_minute=10 ** 9, burst=10 ** 9,
+                            breaker=CircuitBreaker(failure_threshold=10 ** 9))
+
+def run_threads(count, fn):
+    """Run fn(i) on count threads released together; return (results, errors) by thread"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    errors = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = fn(i)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+def sheet_row(backend, name):
+    header = backend.worksheet.values[0]
+    for row in backend.worksheet.values[1:]:
+        if row[0] == name:
+            return dict(zip(header, row + [''] * (len(header) - len(row))))
+    return None
+
+def expire(backend, reader):
+    # Someone else edited the sheet and the cache TTL has run out
+    backend.touch()
+    reader._checked_at = 0.0
+
+def check(name, backend, expected_calls, problems, started):
+    calls = dict(backend.stats['by_method'])
+    elapsed = (time.perf_counter() - started) * 1000
+    ok = expected_calls is None or calls == expected_calls
+    if not ok:
+        problems.append(f"{name}: expected calls {expected_calls}, got {calls}")
+    print(f"{name:<12} {elapsed:>9.1f} ms  calls {calls}  {'ok' if ok else 'MISMATCH'}", file=sys.stderr)
+    return {'ms': round(elapsed, 2), 'calls': calls, 'expected_calls': expected_calls}
+
+def run(threads, rows, mixed_seconds):
+    backend = FakeBackend(rows=rows)
+    reader = SheetReader(None, backend.spreadsheet_id, use_disk_cache=False,
+                         client=backend.client, scheduler=make_scheduler())
+    reader.get_records()
+    backend.latency = LATENCY
+    names = [f"Assignment {i:06d}" for i in range(rows)]
+    problems = []
+    report = {}
+
+    def errors_of(name, errors):
+        for i, error in enumerate(errors):
+            if error is not None:
+                problems.append(f"{name}: thread {i} raised {type(error).__name__}: {error}")
+
+    # Every thread wants the list after an edit: one modifiedTime check, the header once, and one column read
+    expire(backend, reader)
+    backend.reset_stats()
+    started = time.perf_counter()
+    results, errors = run_threads(threads, lambda i: reader.get_assignments())
+    errors_of('revalidate', errors)
+    if any(result != names for result in results if result is not None):
+        problems.append("revalidate: a thread got the wrong assignment list")
+    report['revalidate'] = check('revalidate', backend, {'get_lastUpdateTime': 1, 'row_values': 1, 'batch_get': 1},
+                                  problems, started)
+
+    # Every thread opens the same row, which the refresh left unverified: one row read
+    middle = names[rows // 2]
+    backend.reset_stats()
+    started = time.perf_counter()
+    results, errors = run_threads(threads, lambda i: reader.get_record(middle))
+    errors_of('detail', errors)
+    expected_row = sheet_row(backend, middle)
+    if any(result is not None and {k: str(v) for k, v in result.items()} != expected_row for result in results):
+        problems.append("detail: a thread got a different row than the sheet holds")
+    report['detail'] = check('detail', backend, {'batch_get': 1}, problems, started)
+
+    # Every thread asks for the fully verified snapshot: one modifiedTime read and one download
+    backend.reset_stats()
+    started = time.perf_counter()
+    results, errors = run_threads(threads, lambda i: reader.get_records())
+    errors_of('download', errors)
+    if len({id(result) for result in results if result is not None}) != 1:
+        problems.append("download: threads got different snapshots")
+    report['download'] = check('download', backend, {'get_lastUpdateTime': 1, 'get_all_records': 1},
+                               problems, started)
+
+    # Every thread saves its own assignment: one shared modifiedTime check, then one write each.
+    # Description (B) and File Path (F) aren't adjacent, so each save is one values.batchUpdate
+    targets = names[:threads]
+    backend.reset_stats()
+    started = time.perf_counter()
+    results, errors = run_threads(threads, lambda i: reader.update_record(
+        targets[i], f"/Clients/Stress/{i}.docx", description=f"Written by thread {i}"))
+    errors_of('writes', errors)
+    for i, name in enumerate(targets):
+        if sheet_row(backend, name)['Description'] != f"Written by thread {i}":
+            problems.append(f"writes: {name} is missing thread {i}'s save in the sheet")
+        if reader.cached_record(name)['Description'] != f"Written by thread {i}":
+            problems.append(f"writes: {name} is missing thread {i}'s save in the snapshot")
+    report['writes'] = check('writes', backend, {'get_lastUpdateTime': 1, 'batch_update': threads}, problems, started)
+
+    # Lookups, saves and forced refreshes interleaved: no exact call count, but every answer must be right
+    backend.latency = LATENCY / 10
+    backend.reset_stats()
+    deadline = time.monotonic() + mixed_seconds
+    writers = max(1, threads // 5)
+    written = {}
+    started = time.perf_counter()
+
+    def mixed(i):
+        rng = random.Random(i)
+        lookups = 0
+        while time.monotonic() < deadline:
+            if i == 0:
+                reader.refresh()
+            elif i <= writers:
+                name = names[-i]
+                description = f"Mixed save {lookups} by thread {i}"
+                reader.update_record(name, f"/Clients/Stress/mixed-{i}.docx", description=description)
+                written[name] = description
+            else:
+                name = rng.choice(names)
+                record = reader.get_record(name)
+                if record['Assignment'] != name:
+                    raise AssertionError(f"asked for {name}, got {record['Assignment']}")
+            lookups += 1
+        return lookups
+
+    results, errors = run_threads(threads, mixed)
+    errors_of('mixed', errors)
+    for name, description in written.items():
+        if sheet_row(backend, name)['Description'] != description:
+            problems.append(f"mixed: {name} does not hold its last save in the sheet")
+    report['mixed'] = check('mixed', backend, None, problems, started)
+    report['mixed']['operations'] = sum(result or 0 for result in results)
+    return report, problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=50, help="threads started at once per scenario")
+    parser.add_argument("--rows", type=int, default=10000, help="rows in the fake sheet")
+    parser.add_argument("--mixed-seconds", type=float, default=3.0, help="how long the mixed scenario runs")
+    args = parser.parse_args()
+    if args.threads < 2 or args.rows < args.threads * 2:
+        parser.error("need at least 2 threads and twice as many rows as threads")
+
+    # SheetReader prints a line per save; keep stdout for the JSON report
+    with open(os.devnull, 'w') as quiet, contextlib.redirect_stdout(quiet):
+        report, problems = run(args.threads, args.rows, args.mixed_seconds)
+    print(json.dumps({'threads': args.threads, 'rows': args.rows, 'results': report, 'problems': problems},
+                     indent=2))
+    if problems:
+        print("Problems:\n  " + "\n  ".join(problems), file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""In-process stand-in for the parts of gspread that SheetReader uses.
+
+FakeClient, FakeSpreadsheet and FakeWorksheet answer open_by_key,
+get_worksheet/worksheet, get_lastUpdateTime, row_values, batch_get,
+get_all_records, update and batch_update from plain Python lists, so
+every SheetReader code path can run without a Google account:
+
+    backend = FakeBackend(rows=10000, latency=0.05)
+    reader = SheetReader(None, backend.spreadsheet_id, use_disk_cache=False,
+                         client=backend.client)
+
+Every call is counted along with the JSON size of the request and
+response (FakeBackend.stats), an optional fixed latency is added per
+call, and failures can be injected to exercise retries: a status code
+(429, 503, ...) raises gspread's APIError, and 0 raises a connection
+error.
+"""
+import json
+import random
+import re
+import threading
+import time
+
+import requests
+from gspread.exceptions import APIError
+
+HEADER = ['Assignment', 'Description', 'Due Date', 'Progress', 'Assignee Name', 'File Path']
+PROGRESS = ["Not Started", "WIP", "Done"]
+CELL = re.compile(r"^([A-Z]*)(\d*)$")
+
+def make_rows(rows, seed=1):
+    """Return sheet rows (lists, below the header) shaped like a real tracker"""
+    rng = random.Random(seed)
+    words = ["draft", "review", "final", "notes", "client", "memo", "revise", "summary"]
+    return [[
+        f"Assignment {i:06d}",
+        " ".join(rng.choice(words) for _ in range(rng.randint(5, 60))),
+        f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        rng.choice(PROGRESS),
+        f"Person {rng.randint(0, 24)}",
+        f"/Clients/Client {rng.randint(0, 300)}/Assignment {i:06d}.docx" if rng.random() < 0.6 else "",
+    ] for i in range(rows)]
+
+def column_index(letters):
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index
+
+def parse_range(a1, row_count, column_count):
+    """Return 0-based (first_row, last_row, first_col, last_col), inclusive, for an A1 range"""
+    start, _, end = a1.partition(':')
+    end = end or start
+    start_col, start_row = CELL.match(start).groups()
+    end_col, end_row = CELL.match(end).groups()
+    first_col = column_index(start_col) - 1 if start_col else 0
+    last_col = column_index(end_col) - 1 if end_col else column_count - 1
+    first_row = int(start_row) - 1 if start_row else 0
+    last_row = int(end_row) - 1 if end_row else row_count - 1
+    return first_row, last_row, first_col, last_col
+
+class FakeResponse:
+    """Just enough of requests.Response for gspread's APIError"""
+    def __init__(self, status):
+        self.status_code = status
+        self.headers = {}
+        self.text = ""
+
+    def json(self):
+        return {'error': {'code': self.status_code, 'message': "Injected failure", 'status': "FAKE"}}
+
+class FakeBackend:
+    """One fake spreadsheet with one worksheet, plus call accounting"""
+    def __init__(self, rows=100, latency=0.0, failures=None, fail_rate=0.0, seed=1, spreadsheet_id="fake-sheet"):
+        self.spreadsheet_id = spreadsheet_id
+        self.latency = latency
+        # Statuses to raise on the next calls, in order; then fail_rate picks random 503s
+        self.failures = list(failures or [])
+        self.fail_rate = fail_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset_stats()
+        self.worksheet = FakeWorksheet(self, "Sheet1", [list(HEADER)] + make_rows(rows, seed))
+        self.spreadsheet = FakeSpreadsheet(self, spreadsheet_id, "Fake Tracker", [self.worksheet])
+        self.client = FakeClient(self, {spreadsheet_id: self.spreadsheet})
+
+    def reset_stats(self):
+        self.stats = {'calls': 0, 'by_method': {}, 'request_bytes': 0, 'response_bytes': 0, 'accounting_s': 0.0}
+
+    def touch(self):
+        """Mark the spreadsheet as edited, as Drive's modifiedTime would"""
+        self.spreadsheet.modified += 1
+
+    def call(self, method, request, respond):
+        """Count, delay and maybe fail one API call, then return respond()"""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.stats['calls'] += 1
+            self.stats['by_method'][method] = self.stats['by_method'].get(method, 0) + 1
+            status = self.failures.pop(0) if self.failures else None
+            if status is None and self.fail_rate and self._random.random() < self.fail_rate:
+                status = 503
+        if status == 0:
+            raise requests.exceptions.ConnectionError(f"Injected connection failure in {method}")
+        if status is not None:
+            raise APIError(FakeResponse(status))
+
+        response = respond()
+        started = time.perf_counter()
+        with self._lock:
+            self.stats['request_bytes'] += len(json.dumps(request, default=str))
+            self.stats['response_bytes'] += len(json.dumps(response, default=str))
+            self.stats['accounting_s'] += time.perf_counter() - started
+        return response
+
+class FakeClient:
+    def __init__(self, backend, spreadsheets):
+        self.backend = backend
+        self.spreadsheets = spreadsheets
+
+    def set_timeout(self, timeout):
+        pass
+
+    def open_by_key(self, key):
+        return self.backend.call('open_by_key', {'key': key}, lambda: self.spreadsheets[key])
+
+class FakeSpreadsheet:
+    def __init__(self, backend, spreadsheet_id, title, worksheets):
+        self.backend = backend
+        self.id = spreadsheet_id
+        self.title = title
+        self.worksheets_list = worksheets
+        self.modified = 0
+
+    def get_worksheet(self, index):
+        return self.backend.call('get_worksheet', {'index': index}, lambda: self.worksheets_list[index])
+
+    def worksheet(self, title):
+        return self.backend.call('worksheet', {'title': title},
+                                 lambda: next(ws for ws in self.worksheets_list if ws.title == title))
+
+    def get_lastUpdateTime(self):
+        return self.backend.call('get_lastUpdateTime', {'id': self.id},
+                                 lambda: f"2026-01-01T00:00:{self.modified:02d}.000Z")
+
+class FakeWorksheet:
+    def __init__(self, backend, title, values):
+        self.backend = backend
+        self.title = title
+        # values[0] is the header row, like the real sheet
+        self.values = values
+
+    @property
+    def row_count(self):
+        return len(self.values)
+
+    def _column_count(self):
+        return max(len(row) for row in self.values)
+
+    def _read(self, a1, major_dimension=None):
+        first_row, last_row, first_col, last_col = parse_range(a1, len(self.values), self._column_count())
+        rows = [row[first_col:last_col + 1] for row in self.values[first_row:last_row + 1]]
+        # The API trims empty cells and rows from the end of a range
+        rows = [row[:max((i + 1 for i, cell in enumerate(row) if cell != ''), default=0)] for row in rows]
+        while rows and not rows[-1]:
+            rows.pop()
+        if major_dimension == 'COLUMNS':
+            width = max((len(row) for row in rows), default=0)
+            columns = [[row[i] if i < len(row) else '' for row in rows] for i in range(width)]
+            for column in columns:
+                while column and column[-1] == '':
+                    column.pop()
+            return columns
+        return rows
+
+    def row_values(self, row):
+        return self.backend.call('row_values', {'row': row}, lambda: self._read(f"A{row}:{row}")[0])
+
+    def batch_get(self, ranges, major_dimension=None, value_render_option=None, date_time_render_option=None):
+        return self.backend.call('batch_get', {'ranges': ranges},
+                                 lambda: [self._read(a1, major_dimension) for a1 in ranges])
+
+    def get_all_records(self):
+        def respond():
+            header = self.values[0]
+            return [dict(zip(header, row + [''] * (len(header) - len(row)))) for row in self.values[1:]]
+        return self.backend.call('get_all_records', {}, respond)
+
+    def _write(self, a1, values):
+        first_row, _, first_col, _ = parse_range(a1, len(self.values), self._column_count())
+        for offset, row_values in enumerate(values):
+            row = self.values[first_row + offset]
+            row.extend([''] * (first_col + len(row_values) - len(row)))
+            row[first_col:first_col + len(row_values)] = row_values
+        self.backend.touch()
+
+    def update(self, range_name, values):
+        return self.backend.call('update', {'range': range_name, 'values': values},
+                                 lambda: self._write(range_name, values))
+
+    def batch_update(self, data):
+        def respond():
+            for entry in data:
+                self._write(entry['range'], entry['values'])
+        return self.backend.call('batch_update', {'data': data}, respond)
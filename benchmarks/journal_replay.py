@@ -0,0 +1,149 @@
+"""Write journal replay check against the in-process fake backend.
+
+Journals saves the way the app does and replays them to a SheetReader
+over benchmarks/fake_sheets.py, checking each outcome the replay thread
+relies on:
+
+- coalesce:   several saves to one assignment reach the sheet as one row
+              edit, later fields winning, all in a single write request
+- retry:      while every call fails the saves stay pending, and the next
+              replay after the sheet recovers writes them
+- missing:    a save for an assignment that isn't in the sheet is dropped
+              as failed instead of being retried forever
+- duplicate:  so is a save for a name that appears on more than one row
+
+Exits 1 on any mismatch:
+
+    python3 benchmarks/journal_replay.py --rows 1000
+
+Needs gspread installed, but no credentials or network access.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_sheets import FakeBackend
+from request_scheduler import CircuitBreaker, RequestScheduler
+from SheetReader import SheetReader
+from write_journal import WriteJournal
+
+def make_scheduler():
+    # Real retry policy with short delays, and no per-minute budget: the fake has no quota to protect
+    return RequestScheduler(requests_per_minute=10 ** 9, burst=10 ** 9, max_retries=2, base_delay=0.01,
+                            max_delay=0.02, breaker=CircuitBreaker(failure_threshold=10 ** 9))
+
+def sheet_row(backend, name):
+    header = backend.worksheet.values[0]
+    for row in backend.worksheet.values[1:]:
+        if row[0] == name:
+            return dict(zip(header, row + [''] * (len(header) - len(row))))
+    return None
+
+def writes(backend):
+    return backend.stats['by_method'].get('update', 0) + backend.stats['by_method'].get('batch_update', 0)
+
+def run(rows, journal_path):
+    backend = FakeBackend(rows=rows)
+    reader = SheetReader(None, backend.spreadsheet_id, use_disk_cache=False,
+                         client=backend.client, scheduler=make_scheduler())
+    reader.get_records()
+    journal = WriteJournal(journal_path)
+    names = [f"Assignment {i:06d}" for i in range(rows)]
+    problems = []
+    report = {}
+
+    def expect(scenario, condition, message):
+        if not condition:
+            problems.append(f"{scenario}: {message}")
+
+    def replay(scenario):
+        backend.reset_stats()
+        started = time.perf_counter()
+        results = journal.replay(reader)
+        report[scenario] = {'ms': round((time.perf_counter() - started) * 1000, 2), 'results': results,
+                            'calls': dict(backend.stats['by_method'])}
+        return results
+
+    # Three saves to one row and one to another become one row edit each, sent in one request
+    first, second = names[1], names[2]
+    journal.append(first, None, description="First draft", progress="WIP")
+    journal.append(first, "/Clients/Replay/first.docx", description="Second draft")
+    journal.append(first, None, assignee="Person Replay")
+    journal.append(second, None, due_date="2026-12-31")
+    results = replay('coalesce')
+    expect('coalesce', results == {first: True, second: True}, f"expected both written, got {results}")
+    expect('coalesce', writes(backend) == 1, f"expected one write request, got {report['coalesce']['calls']}")
+    row = sheet_row(backend, first)
+    expected = {'Description': "Second draft", 'Progress': "WIP", 'Assignee Name': "Person Replay",
+                'File Path': "/Clients/Replay/first.docx"}
+    expect('coalesce', all(row[column] == value for column, value in expected.items()),
+           f"{first} holds {row}, expected {expected}")
+    expect('coalesce', sheet_row(backend, second)['Due Date'] == "2026-12-31", f"{second} is missing its due date")
+    expect('coalesce', journal.pending_count() == 0, f"{journal.pending_count()} saves still pending")
+
+    # Every call fails: nothing is written or dropped, and the save is written once the sheet is back
+    third = names[3]
+    journal.append(third, None, description="Saved offline")
+    reader._checked_at = 0.0
+    backend.fail_rate = 1.0
+    results = replay('retry_offline')
+    expect('retry', results == {third: False}, f"expected the save kept for retry, got {results}")
+    expect('retry', writes(backend) == 0, "wrote to the sheet while it was failing")
+    expect('retry', journal.pending_count() == 1, f"expected 1 pending save, got {journal.pending_count()}")
+    backend.fail_rate = 0.0
+    results = replay('retry_recovered')
+    expect('retry', results == {third: True}, f"expected the save written after recovery, got {results}")
+    expect('retry', sheet_row(backend, third)['Description'] == "Saved offline", f"{third} is missing its save")
+    expect('retry', journal.pending_count() == 0, f"{journal.pending_count()} saves still pending")
+
+    # A name that isn't in the sheet is dropped as failed, and doesn't hold up the rest of the batch
+    fourth = names[4]
+    journal.append("Not In The Sheet", None, description="Nowhere to go")
+    journal.append(fourth, None, description="Written alongside")
+    results = replay('missing')
+    expect('missing', results == {"Not In The Sheet": None, fourth: True}, f"got {results}")
+    expect('missing', journal.pending_count() == 0, f"{journal.pending_count()} saves still pending")
+
+    # A name on two rows can't be written unambiguously, so it is dropped as failed too
+    duplicate = names[5]
+    backend.worksheet.values[7][0] = duplicate
+    backend.touch()
+    reader._checked_at = 0.0
+    journal.append(duplicate, None, description="Which row?")
+    results = replay('duplicate')
+    expect('duplicate', results == {duplicate: None}, f"got {results}")
+    expect('duplicate', writes(backend) == 0, "wrote to an ambiguous row")
+    expect('duplicate', journal.pending_count() == 0, f"{journal.pending_count()} saves still pending")
+
+    failed = {assignment for _, assignment, _ in journal.failed_entries()}
+    expect('failed', failed == {"Not In The Sheet", duplicate}, f"failed entries are {sorted(failed)}")
+
+    for scenario, result in report.items():
+        print(f"{scenario:<16} {result['ms']:>8.1f} ms  calls {result['calls']}", file=sys.stderr)
+    return report, problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="rows in the fake sheet")
+    args = parser.parse_args()
+    if args.rows < 10:
+        parser.error("need at least 10 rows")
+
+    with tempfile.TemporaryDirectory() as directory:
+        # SheetReader and the scheduler print a line per save and retry; keep stdout for the JSON report
+        with contextlib.redirect_stdout(sys.stderr):
+            report, problems = run(args.rows, os.path.join(directory, "journal.db"))
+    print(json.dumps({'rows': args.rows, 'results': report, 'problems': problems}, indent=2, default=str))
+    if problems:
+        print("Problems:\n  " + "\n  ".join(problems), file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Memory and import-time comparison of RecordStore against a pandas DataFrame.
+
+Builds a synthetic sheet shaped like the tracker (default 10,000 rows) and
+reports, for each representation:
+
+- import time of the module that provides it, in a fresh interpreter
+- memory retained by the snapshot, measured with tracemalloc
+- time to build it from get_all_records()-style dicts
+- time for a single-field lookup by position
+
+    python3 benchmarks/record_store_bench.py --rows 10000
+
+pandas is optional; its columns are skipped when it is not installed.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from record_store import RecordStore
+
+PROGRESS = ["Not Started", "WIP", "Done"]
+ASSIGNEES = [f"Person {i}" for i in range(25)]
+
+def make_records(rows, seed=1):
+    """Return rows shaped like worksheet.get_all_records() output"""
+    rng = random.Random(seed)
+    return [{
+        'Assignment': f"Assignment {i:06d}",
+        'Description': " ".join(rng.choice(["draft", "review", "final", "notes", "client", "memo"])
+                                for _ in range(rng.randint(5, 40))),
+        # Values come off the wire as separate str objects, so don't share them here either
+        'Due Date': f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        'Progress': "".join(rng.choice(PROGRESS)),
+        'Assignee Name': "".join(rng.choice(ASSIGNEES)),
+        'File Path': f"/Clients/{rng.randint(1, 500)}/file-{i}.docx",
+    } for i in range(rows)]
+
+def import_ms(module):
+    """Time importing a module in a fresh interpreter"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return round(float(result.stdout.strip()) * 1000, 1)
+
+def measure(build, rows):
+    """Return (store, retained bytes, build ms) for one representation.
+
+    The source rows are generated under tracemalloc and dropped after the
+    build, so the figure is what the snapshot keeps alive on its own.
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    records = make_records(rows)
+    started = time.perf_counter()
+    store = build(records)
+    build_ms = (time.perf_counter() - started) * 1000
+    del records
+    gc.collect()
+    retained = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, 'filename'))
+    tracemalloc.stop()
+    return store, retained, build_ms
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    results = {'rows': args.rows}
+
+    store, retained, build_ms = measure(RecordStore, args.rows)
+    position = args.rows // 2
+    started = time.perf_counter()
+    for _ in range(1000):
+        store['Progress'][position]
+    lookup_us = (time.perf_counter() - started) * 1000
+    results['record_store'] = {
+        'import_ms': import_ms("record_store"),
+        'retained_mb': round(retained / 1e6, 2),
+        'build_ms': round(build_ms, 1),
+        'lookup_us': round(lookup_us, 3),
+    }
+    del store
+
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+    if pd is not None:
+        frame, retained, build_ms = measure(pd.DataFrame, args.rows)
+        started = time.perf_counter()
+        for _ in range(1000):
+            frame['Progress'].iat[position]
+        lookup_us = (time.perf_counter() - started) * 1000
+        results['pandas'] = {
+            'import_ms': import_ms("pandas"),
+            'retained_mb': round(retained / 1e6, 2),
+            'build_ms': round(build_ms, 1),
+            'lookup_us': round(lookup_us, 3),
+        }
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
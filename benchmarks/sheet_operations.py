@@ -0,0 +1,157 @@
+"""SheetReader operation benchmark against the in-process fake backend.
+
+Runs each operation the app performs against benchmarks/fake_sheets.py at
+several sheet sizes and reports wall time, API calls and bytes moved:
+
+- list_load:        connect with no snapshot and read the assignment list
+- list_revalidate:  the sheet changed; bring the list up to date
+- detail_load:      open one assignment after the sheet changed
+- save:             write one assignment's changed cells
+- save_unchanged:   save the same values again, which should send nothing
+- bulk_save:        write BULK_ROWS rows in one batch
+- watch_idle:       poll for changes when nothing changed
+- watch_change:     poll for changes after an assignment was renamed
+
+Every operation has a budget of API calls; with --check the script exits
+with status 1 when any operation goes over, so a CI job catches
+regressions like a save that refetches the sheet once per field:
+
+    python3 benchmarks/sheet_operations.py --rows 100,10000,100000 --check > sheet-ops.json
+
+--latency adds a fixed delay to every fake call and --fail-rate injects
+503s to exercise the retry path. Needs gspread installed, but no
+credentials or network access.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_sheets import FakeBackend
+from request_scheduler import CircuitBreaker, RequestScheduler
+from SheetReader import SheetReader
+
+BULK_ROWS = 100
+
+# Most API calls each operation may make; reads after a change cost a modifiedTime
+# check, the Assignment column and the rows being shown or backfilled. Writes always
+# check modifiedTime first, and after any earlier write (our own included) also
+# reread the Assignment column and the rows they touch
+CALL_BUDGETS = {
+    'list_load': 4,
+    'list_revalidate': 3,
+    'detail_load': 3,
+    'save': 2,
+    'save_unchanged': 0,
+    'bulk_save': 4,
+    'watch_idle': 1,
+    'watch_change': 2,
+}
+
+def make_scheduler():
+    # Real retry policy, but no per-minute budget: the fake has no quota to protect
+    return RequestScheduler(requests_per_minute=10 ** 9, burst=10 ** 9, base_delay=0.01, max_delay=0.1,
+                            breaker=CircuitBreaker(failure_threshold=10 ** 9))
+
+def measure(backend, operation):
+    """Run operation once and return its wall time, API calls and bytes"""
+    backend.reset_stats()
+    started = time.perf_counter()
+    operation()
+    elapsed = time.perf_counter() - started - backend.stats['accounting_s']
+    return {
+        'ms': round(elapsed * 1000, 2),
+        'calls': backend.stats['calls'],
+        'by_method': dict(backend.stats['by_method']),
+        'request_bytes': backend.stats['request_bytes'],
+        'response_bytes': backend.stats['response_bytes'],
+    }
+
+def run(rows, latency, fail_rate):
+    backend = FakeBackend(rows=rows, latency=latency, fail_rate=fail_rate)
+    reader = None
+    names = [f"Assignment {i:06d}" for i in range(rows)]
+    middle = names[rows // 2]
+
+    def list_load():
+        nonlocal reader
+        reader = SheetReader(None, backend.spreadsheet_id, use_disk_cache=False,
+                             client=backend.client, scheduler=make_scheduler())
+        reader.get_assignments()
+
+    def expire():
+        # Someone else edited the sheet and the cache TTL has run out
+        backend.touch()
+        reader._checked_at = 0.0
+
+    def list_revalidate():
+        reader.get_assignments()
+
+    def detail_load():
+        reader.get_record(middle)
+
+    def save():
+        reader.update_record(middle, "/Clients/Benchmark/file.docx", description="Benchmark save")
+
+    def save_unchanged():
+        save()
+
+    def bulk_save():
+        step = max(1, rows // BULK_ROWS)
+        reader.update_records([{'assignment': name, 'file_path': "/Clients/Benchmark/bulk.docx", 'progress': "WIP"}
+                               for name in names[::step][:BULK_ROWS]])
+
+    results = {'list_load': measure(backend, list_load)}
+    expire()
+    results['list_revalidate'] = measure(backend, list_revalidate)
+    expire()
+    results['detail_load'] = measure(backend, detail_load)
+    results['save'] = measure(backend, save)
+    results['save_unchanged'] = measure(backend, save_unchanged)
+    results['bulk_save'] = measure(backend, bulk_save)
+
+    # The watcher's first poll reports the current list; later ones only report changes
+    reader.poll_changes()
+    results['watch_idle'] = measure(backend, reader.poll_changes)
+    backend.worksheet.values[rows // 2 + 1][0] = f"{middle} (renamed)"
+    backend.touch()
+    results['watch_change'] = measure(backend, reader.poll_changes)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="100,10000,100000", help="comma-separated sheet sizes")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every fake API call")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of fake API calls that return 503")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any operation exceeds its call budget")
+    args = parser.parse_args()
+
+    report = {'latency': args.latency, 'fail_rate': args.fail_rate, 'budgets': CALL_BUDGETS, 'results': {}}
+    over_budget = []
+    for rows in [int(value) for value in args.rows.split(",")]:
+        # SheetReader reports progress on stdout; keep stdout for the JSON report
+        with contextlib.redirect_stdout(sys.stderr):
+            results = run(rows, args.latency, args.fail_rate)
+        report['results'][rows] = results
+        for operation, result in results.items():
+            print(f"{rows:>7} rows  {operation:<16} {result['ms']:>10.2f} ms  {result['calls']:>3} calls  "
+                  f"{result['response_bytes']:>11} bytes in", file=sys.stderr)
+            # Retried calls are expected when failures are injected
+            if not args.fail_rate and result['calls'] > CALL_BUDGETS[operation]:
+                over_budget.append(f"{operation} at {rows} rows: {result['calls']} calls "
+                                   f"(budget {CALL_BUDGETS[operation]}) {result['by_method']}")
+
+    report['over_budget'] = over_budget
+    print(json.dumps(report, indent=2))
+    if over_budget:
+        print("Over budget:\n  " + "\n  ".join(over_budget), file=sys.stderr)
+        if args.check:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
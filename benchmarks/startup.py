@@ -0,0 +1,88 @@
+"""Startup benchmark for Assignment Tracker.
+
+Launches main.py several times with ASSIGNMENT_TRACKER_STARTUP_BENCHMARK=1
+and reports, in milliseconds from process launch:
+
+- first-paint:  the main window has been shown
+- cached-list:  the dropdown was filled from the on-disk snapshot
+- interactive:  the live assignment list has loaded
+
+It also runs ``python -X importtime -c "import main"`` and lists the
+slowest imports on the startup path. Results are printed as JSON so they
+can be stored and compared across releases:
+
+    python3 benchmarks/startup.py --runs 5 > startup-1.2.0.json
+
+Requires a configured ~/.assignment_tracker and no other running instance.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MARKS = ['first-paint', 'cached-list', 'interactive']
+
+def time_launch(timeout):
+    """Run the app once and return {mark: ms since launch}"""
+    env = dict(os.environ, ASSIGNMENT_TRACKER_STARTUP_BENCHMARK="1")
+    started = time.time()
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "main.py")],
+                            cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout)
+    marks = {}
+    for line in result.stdout.splitlines():
+        if line.startswith("startup-mark "):
+            _, name, stamp = line.split()
+            marks[name] = (float(stamp) - started) * 1000
+    return marks
+
+def import_times(limit):
+    """Return the slowest cumulative imports reported by -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=ROOT, capture_output=True, text=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append({
+            'module': name.strip(),
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+        })
+    imports.sort(key=lambda entry: entry['cumulative_ms'], reverse=True)
+    total = sum(entry['self_ms'] for entry in imports)
+    return total, imports[:limit]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--top-imports", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [time_launch(args.timeout) for _ in range(args.runs)]
+    summary = {}
+    for mark in MARKS:
+        values = [run[mark] for run in runs if mark in run]
+        if values:
+            summary[mark] = {
+                'median_ms': round(statistics.median(values), 1),
+                'min_ms': round(min(values), 1),
+                'max_ms': round(max(values), 1),
+            }
+
+    import_total, slowest = import_times(args.top_imports)
+    print(json.dumps({
+        'python': sys.version.split()[0],
+        'runs': args.runs,
+        'startup': summary,
+        'import_main_ms': round(import_total, 1),
+        'slowest_imports': slowest,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Headless command line access to the assignment spreadsheet.
+
+Uses the app's configuration in ~/.assignment_tracker/ (run the app once
+to set it up) and never loads the GUI, so it works over SSH and in cron
+jobs and CI:
+
+    python3 cli.py list
+    python3 cli.py get "Essay 3"
+    python3 cli.py set "Essay 3" --progress Done --assignee Sam
+    python3 cli.py link "Essay 3" ~/Dropbox/Clients/Essay3.docx
+    python3 cli.py --format ndjson export > assignments.ndjson
+    python3 cli.py batch < commands.txt
+
+Results are written to stdout as JSON, or with --format ndjson one item
+per line; progress and errors go to stderr. --cached answers list, get
+and export from the snapshot the app last saved, without connecting.
+
+batch reads one command per line from stdin (blank lines and # comments
+are skipped) and runs them over one connection, sending consecutive set
+and link commands as a single write. It prints one JSON object per line:
+{"line": n, "command": ..., "ok": true, "result": ...}, or "ok": false
+with an "error". The exit status is 1 if any command failed.
+"""
+import argparse
+import contextlib
+import json
+import os
+import shlex
+import sys
+
+from dotenv import load_dotenv
+from file_links import dropbox_relative_path
+from sheet_errors import AssignmentNotFoundError, SheetError
+from sheet_sources import load_cached_records
+
+# SheetReader (gspread, google-auth) is imported when a command first needs the spreadsheet,
+# so --cached reads start without it.
+
+CONFIG_DIR = os.path.expanduser("~/.assignment_tracker")
+CREDENTIALS_PATH = os.path.join(CONFIG_DIR, "credentials.json")
+ENV_PATH = os.path.join(CONFIG_DIR, ".env")
+
+PROGRESS_CHOICES = ["Not Started", "WIP", "Done"]
+
+# Commands queued and sent together by batch
+WRITE_COMMANDS = ('set', 'link')
+
+class CommandError(Exception):
+    """A command that can't be run as given"""
+
+class CommandParser(argparse.ArgumentParser):
+    """Raises CommandError instead of exiting, so one bad batch line doesn't end the batch"""
+    def error(self, message):
+        raise CommandError(f"{self.prog}: {message}")
+
+class Session:
+    """Runs commands against a reader connected on first use, or against the saved snapshot"""
+    def __init__(self, sheet_config, cached=False):
+        self.sheet_config = sheet_config
+        self.cached = cached
+        self._reader = None
+        self._snapshot = None
+
+    @property
+    def reader(self):
+        if self.cached:
+            raise CommandError("writes need the spreadsheet; run without --cached")
+        if self._reader is None:
+            from multi_sheet_reader import open_sheet_reader
+            self._reader = open_sheet_reader(CREDENTIALS_PATH, self.sheet_config)
+        return self._reader
+
+    def snapshot(self):
+        """Return the saved snapshot as (records, {assignment: record})"""
+        if self._snapshot is None:
+            records = load_cached_records(self.sheet_config)
+            if records is None:
+                raise CommandError("no saved snapshot yet; run without --cached once")
+            by_name = {}
+            for record in records:
+                by_name.setdefault(str(record.get('Assignment')), record)
+            self._snapshot = (records, by_name)
+        return self._snapshot
+
+    def list(self, args):
+        if self.cached:
+            return [record.get('Assignment') for record in self.snapshot()[0]]
+        return self.reader.get_assignments()
+
+    def get(self, args):
+        if not self.cached:
+            return [self.reader.get_record(name) for name in args.assignments]
+        _, by_name = self.snapshot()
+        records = []
+        for name in args.assignments:
+            if name not in by_name:
+                raise AssignmentNotFoundError(f"'{name}' not found in the saved snapshot")
+            records.append(by_name[name])
+        return records
+
+    def export(self, args):
+        if self.cached:
+            return self.snapshot()[0]
+        return self.reader.export_records()
+
+    def write(self, updates):
+        """Send update_record keyword arguments in one request; return {assignment: written}"""
+        return self.reader.update_records(updates)
+
+def write_update(args):
+    """Turn a parsed set or link command into update_record keyword arguments"""
+    if args.command == 'link':
+        # Stored the way the app stores it: the part after the Dropbox folder
+        return {'assignment': args.assignment,
+                'file_path': dropbox_relative_path(os.path.expanduser(args.file_path))}
+    update = {'assignment': args.assignment, 'file_path': None, 'description': args.description,
+              'due_date': args.due_date, 'progress': args.progress, 'assignee': args.assignee}
+    if not any(update[field] for field in ('description', 'due_date', 'progress', 'assignee')):
+        raise CommandError("set needs at least one of --description, --due-date, --progress, --assignee")
+    return update
+
+def run_command(session, args):
+    """Run one parsed command and return its result"""
+    if args.command in WRITE_COMMANDS:
+        update = write_update(args)
+        if not session.write([update]).get(update['assignment']):
+            raise AssignmentNotFoundError(f"'{update['assignment']}' not found in the sheet, or not unique")
+        return {'assignment': update['assignment'], 'written': True}
+    return getattr(session, args.command)(args)
+
+def emit(result, output_format, out):
+    """Write a result as one JSON document, or as one line per item for ndjson"""
+    if output_format == 'ndjson' and isinstance(result, list):
+        for item in result:
+            out.write(json.dumps(item, ensure_ascii=False, default=str) + "\n")
+    else:
+        out.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+
+def run_batch(session, parser, lines, out):
+    """Run one command per line, writing one result object per line; return whether all succeeded"""
+    all_ok = True
+    queued = []
+
+    def report(number, line, result=None, error=None):
+        nonlocal all_ok
+        entry = {'line': number, 'command': line, 'ok': error is None}
+        if error is None:
+            entry['result'] = result
+        else:
+            entry['error'] = error
+            all_ok = False
+        emit(entry, 'json', out)
+
+    def flush():
+        # Consecutive writes go out as one request, before any read that might depend on them
+        if not queued:
+            return
+        try:
+            written = session.write([update for _, _, update in queued])
+            for number, line, update in queued:
+                if written.get(update['assignment']):
+                    report(number, line, {'assignment': update['assignment'], 'written': True})
+                else:
+                    report(number, line, error=f"'{update['assignment']}' not found in the sheet, or not unique")
+        except (SheetError, CommandError, ValueError) as e:
+            for number, line, _ in queued:
+                report(number, line, error=str(e))
+        queued.clear()
+
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            args = parser.parse_args(shlex.split(line))
+            if args.command == 'batch':
+                raise CommandError("batch can't be nested")
+            if args.command in WRITE_COMMANDS:
+                queued.append((number, line, write_update(args)))
+                continue
+        except (CommandError, ValueError) as e:
+            report(number, line, error=str(e))
+            continue
+        except SystemExit:
+            report(number, line, error="--help is not available in a batch")
+            continue
+        flush()
+        try:
+            report(number, line, run_command(session, args))
+        except (SheetError, CommandError, ValueError) as e:
+            report(number, line, error=str(e))
+    flush()
+    return all_ok
+
+def build_parser():
+    parser = CommandParser(prog="assignment-tracker", description=__doc__,
+                           formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=["json", "ndjson"], default="json",
+                        help="json prints one document, ndjson one list item per line")
+    parser.add_argument("--cached", action="store_true",
+                        help="answer reads from the last saved snapshot without connecting (may be out of date)")
+    commands = parser.add_subparsers(dest="command", metavar="command", required=True)
+
+    commands.add_parser("list", help="print every assignment name")
+
+    get_parser = commands.add_parser("get", help="print the full row of one or more assignments")
+    get_parser.add_argument("assignments", nargs="+", metavar="assignment")
+
+    set_parser = commands.add_parser("set", help="change an assignment's fields; empty values are left as they are")
+    set_parser.add_argument("assignment")
+    set_parser.add_argument("--description")
+    set_parser.add_argument("--due-date")
+    set_parser.add_argument("--progress", choices=PROGRESS_CHOICES)
+    set_parser.add_argument("--assignee")
+
+    link_parser = commands.add_parser("link", help="link a file to an assignment")
+    link_parser.add_argument("assignment")
+    link_parser.add_argument("file_path", metavar="file")
+
+    commands.add_parser("export", help="print every row with every cell current")
+    commands.add_parser("batch", help="run commands read from stdin, one per line")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except CommandError as e:
+        parser.print_usage(sys.stderr)
+        print(e, file=sys.stderr)
+        return 2
+
+    if not os.path.exists(CREDENTIALS_PATH) or not os.path.exists(ENV_PATH):
+        print(f"Not configured: run the Assignment Tracker app once to set up {CONFIG_DIR}", file=sys.stderr)
+        return 2
+    load_dotenv(ENV_PATH)
+    session = Session(os.getenv("SHEET_ID"), cached=args.cached)
+
+    # The readers report progress with print(); keep stdout for results
+    out = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.command == 'batch':
+            return 0 if run_batch(session, parser, sys.stdin, out) else 1
+        try:
+            result = run_command(session, args)
+        except (SheetError, CommandError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+    try:
+        emit(result, args.format, out)
+    except BrokenPipeError:
+        # The reader (head, a closed pipe) stopped early; don't report it as a failure
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import time
+from collections import OrderedDict
+
+# Bytes of record text kept before the least recently used entries are dropped
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+# Seconds an entry is served for, matching SheetReader's snapshot TTL
+DEFAULT_MAX_AGE = 30
+
+# Rough per-entry cost of the dict and tuple around a record
+ENTRY_OVERHEAD = 200
+
+def record_size(assignment, record):
+    """Estimate the memory a cached record holds, from the length of its text"""
+    return ENTRY_OVERHEAD + len(str(assignment)) + sum(len(str(column)) + len(str(value))
+                                                       for column, value in record.items())
+
+class DetailCache:
+    """Least-recently-used cache of assignment detail records, bounded by size.
+
+    Holds the (record, exists) pairs the details form is filled from, so an
+    assignment that was prefetched or recently opened loads from memory.
+    Entries older than max_age are treated as missing, and the least
+    recently used ones are evicted once their estimated size passes
+    max_bytes. Only used from the GUI thread.
+    """
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, assignment):
+        return self._fresh_entry(assignment) is not None
+
+    def _fresh_entry(self, assignment):
+        entry = self._entries.get(assignment)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[3] > self.max_age:
+            self.discard(assignment)
+            return None
+        return entry
+
+    def get(self, assignment):
+        """Return (record, exists) for a fresh entry, or None"""
+        entry = self._fresh_entry(assignment)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(assignment)
+        record, exists, _, _ = entry
+        return dict(record), exists
+
+    def put(self, assignment, record, exists=True):
+        self.discard(assignment)
+        record = dict(record)
+        size = record_size(assignment, record)
+        if size > self.max_bytes:
+            return
+        self._entries[assignment] = (record, exists, size, time.monotonic())
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, _, evicted, _) = self._entries.popitem(last=False)
+            self.size -= evicted
+
+    def update(self, assignment, changes):
+        """Apply saved column values to a cached record, keeping its age"""
+        entry = self._entries.get(assignment)
+        if entry is None:
+            return
+        record, exists, _, fetched_at = entry
+        record = dict(record, **changes)
+        self.discard(assignment)
+        size = record_size(assignment, record)
+        self._entries[assignment] = (record, exists, size, fetched_at)
+        self.size += size
+
+    def discard(self, assignment):
+        entry = self._entries.pop(assignment, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
@@ -0,0 +1,79 @@
+import os
+import unicodedata
+
+def dropbox_relative_path(file_path):
+    """Extract the path after 'dropbox' (case insensitive)"""
+    if not file_path:
+        return file_path
+
+    # Find 'dropbox' in the path (case insensitive)
+    dropbox_index = file_path.lower().find('dropbox')
+    if dropbox_index != -1:
+        # The stored path starts at the next '/' after 'dropbox'
+        start_index = file_path.find('/', dropbox_index + len('dropbox'))
+        if start_index != -1:
+            return file_path[start_index:]
+
+    # If 'dropbox' not found, return the original path
+    return file_path
+
+def normalize_link_path(file_path):
+    """Reduce a local or stored path to the key used to match File Path cells.
+
+    Both an absolute path on this machine and the Dropbox-relative value
+    written to the sheet normalize to the same key: the part after the
+    Dropbox folder, in NFC form, with forward slashes and folded case
+    (the macOS and Windows file systems are case-insensitive).
+    """
+    if not file_path:
+        return None
+    path = unicodedata.normalize('NFC', str(file_path).strip()).replace('\\', '/')
+    path = dropbox_relative_path(path)
+    path = os.path.normpath(path).replace('\\', '/')
+    if path == '.':
+        return None
+    return path.casefold()
+
+class FileLinkIndex:
+    """Hash index from a linked file's normalized path to its assignment.
+
+    Built alongside the sheet snapshot from the File Path column, so
+    finding the assignment for an opened file is a single dict lookup.
+    When several rows link the same file, the first row wins, matching
+    how duplicate assignment names are resolved.
+    """
+    __slots__ = ('_by_path', '_by_assignment')
+
+    def __init__(self, assignments=(), file_paths=()):
+        self._by_path = {}
+        self._by_assignment = {}
+        for assignment, file_path in zip(assignments, file_paths):
+            key = normalize_link_path(file_path)
+            if key is not None and assignment not in self._by_assignment:
+                self._by_path.setdefault(key, assignment)
+                self._by_assignment[assignment] = key
+
+    @classmethod
+    def from_records(cls, records):
+        """Build from row dicts, as loaded from an on-disk snapshot"""
+        records = list(records or [])
+        return cls([record.get('Assignment') for record in records],
+                   [record.get('File Path') for record in records])
+
+    def __len__(self):
+        return len(self._by_path)
+
+    def lookup(self, file_path):
+        """Return the assignment linked to file_path, or None"""
+        key = normalize_link_path(file_path)
+        return self._by_path.get(key) if key is not None else None
+
+    def link(self, file_path, assignment):
+        """Point file_path at assignment, replacing the assignment's previous link"""
+        old_key = self._by_assignment.pop(assignment, None)
+        if old_key is not None and self._by_path.get(old_key) == assignment:
+            del self._by_path[old_key]
+        key = normalize_link_path(file_path)
+        if key is not None:
+            self._by_path[key] = assignment
+            self._by_assignment[assignment] = key
@@ -0,0 +1,138 @@
+import datetime
+import json
+import os
+import threading
+import time
+
+import gspread
+import metrics
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2.service_account import Credentials
+
+scopes = [
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive'
+]
+
+# Lives next to credentials.json; holds short-lived access tokens only, never the private key
+DEFAULT_TOKEN_CACHE_PATH = os.path.expanduser("~/.assignment_tracker/token_cache.json")
+
+# (connect, read) seconds for each HTTP request, so a hung connection can't stall a call forever
+REQUEST_TIMEOUT = (10, 60)
+
+# A cached token this close to expiry is exchanged for a new one instead
+TOKEN_EXPIRY_MARGIN = datetime.timedelta(minutes=5)
+
+# Where the access token came from and milliseconds spent getting it, for benchmarks/auth.py
+timings = {}
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def _read_token_cache(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_token_cache(path, cache):
+    """Write the cache readable only by the current user, replacing the old file atomically"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.tmp"
+    try:
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(cache, f)
+        os.replace(temp_path, path)
+    except Exception as e:
+        print(f"Error saving token cache: {e}")
+
+def _cache_key(info):
+    # Tokens are tied to the service account key and the scopes they were granted for
+    return f"{info.get('client_email')}:{info.get('private_key_id')}:{' '.join(scopes)}"
+
+def load_credentials(credentials_path, token_cache_path=DEFAULT_TOKEN_CACHE_PATH):
+    """Return (credentials, cache key), adopting a cached access token if it is still fresh"""
+    with open(credentials_path, 'r') as f:
+        info = json.load(f)
+    credentials = Credentials.from_service_account_info(info, scopes=scopes)
+    key = _cache_key(info)
+
+    entry = _read_token_cache(token_cache_path).get(key)
+    if entry:
+        try:
+            expiry = datetime.datetime.fromisoformat(entry['expiry'])
+        except (KeyError, TypeError, ValueError):
+            expiry = None
+        # google-auth keeps expiry as naive UTC
+        if expiry is not None and expiry - TOKEN_EXPIRY_MARGIN > datetime.datetime.utcnow():
+            credentials.token = entry['token']
+            credentials.expiry = expiry
+    return credentials, key
+
+def save_token(credentials, key, token_cache_path=DEFAULT_TOKEN_CACHE_PATH):
+    if not credentials.token or credentials.expiry is None:
+        return
+    cache = _read_token_cache(token_cache_path)
+    # Drop other entries that have expired so the file doesn't grow
+    now = datetime.datetime.utcnow().isoformat()
+    cache = {k: v for k, v in cache.items() if v.get('expiry', '') > now}
+    cache[key] = {'token': credentials.token, 'expiry': credentials.expiry.isoformat()}
+    _write_token_cache(token_cache_path, cache)
+
+def _body_size(data, json_body):
+    if json_body is not None:
+        return len(json.dumps(json_body))
+    if isinstance(data, (bytes, str)):
+        return len(data)
+    return 0
+
+class TokenCachingSession(AuthorizedSession):
+    """Keep-alive session that writes refreshed access tokens back to the cache and counts body bytes"""
+    def __init__(self, credentials, key, token_cache_path=DEFAULT_TOKEN_CACHE_PATH):
+        super().__init__(credentials)
+        self.key = key
+        self.token_cache_path = token_cache_path
+        self._saved_token = credentials.token
+
+    def request(self, method, url, *args, **kwargs):
+        response = super().request(method, url, *args, **kwargs)
+        metrics.record_bytes(_body_size(kwargs.get('data'), kwargs.get('json')), len(response.content))
+        # AuthorizedSession refreshes an expired token itself; persist the new one
+        if self.credentials.token != self._saved_token:
+            self._saved_token = self.credentials.token
+            save_token(self.credentials, self.key, self.token_cache_path)
+        return response
+
+def authorized_client(credentials_path, token_cache_path=DEFAULT_TOKEN_CACHE_PATH):
+    """Return the process-wide gspread client for a service account.
+
+    Every SheetReader (and the setup wizard's connection test) shares one
+    client and so one keep-alive HTTP session. The access token comes from
+    the on-disk cache when it is still valid, which skips signing a JWT and
+    the token exchange round trip; otherwise it is fetched once and saved.
+    """
+    credentials, key = load_credentials(credentials_path, token_cache_path)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is not None:
+            return client
+
+        session = TokenCachingSession(credentials, key, token_cache_path)
+        started = time.perf_counter()
+        if credentials.valid:
+            timings['token_source'] = 'cache'
+        else:
+            # Through the session's plain auth transport: the session itself would refresh the
+            # still-invalid credentials before sending, exchanging a token twice
+            credentials.refresh(session._auth_request)
+            session._saved_token = credentials.token
+            save_token(credentials, key, token_cache_path)
+            timings['token_source'] = 'exchange'
+        timings['token_ms'] = (time.perf_counter() - started) * 1000
+
+        client = gspread.authorize(credentials, session=session)
+        client.set_timeout(REQUEST_TIMEOUT)
+        _clients[key] = client
+        return client
@@ -0,0 +1,168 @@
+import heapq
+import math
+import os
+import re
+
+from file_links import dropbox_relative_path
+from search_index import trigrams
+
+DEFAULT_SUGGESTIONS = 5
+
+# How much a word counts when it appears in the assignment name vs its description
+NAME_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.3
+
+# How much a word from the file name counts vs one from its folders
+FILE_NAME_WEIGHT = 1.0
+FOLDER_WEIGHT = 0.5
+
+# Folders above the file that are considered, nearest first
+FOLDER_DEPTH = 3
+
+# Words in more than this share of a large sheet only re-rank matches found through rarer words
+COMMON_WORD_SHARE = 0.2
+COMMON_WORD_MIN_ROWS = 1000
+
+# Minimum trigram overlap for a misspelled or abbreviated word to stand in for a known one
+SIMILAR_WORD_MIN_SCORE = 0.5
+
+WORD = re.compile(r"[^\W\d_]+|\d+")
+
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'the', 'of', 'for', 'to', 'in', 'on', 'by',
+    'copy', 'draft', 'final', 'new', 'old', 'rev', 'v',
+})
+
+def words(text):
+    """Split text into lowercased words and numbers, dropping filler"""
+    if not text:
+        return []
+    return [word for word in WORD.findall(str(text).casefold()) if word not in STOP_WORDS]
+
+def path_words(file_path):
+    """Return (word, weight) pairs for a file's name and the folders above it"""
+    path = dropbox_relative_path(str(file_path).replace('\\', '/'))
+    folders = [part for part in path.split('/') if part]
+    name = os.path.splitext(folders.pop())[0] if folders else ""
+    weighted = {}
+    for word in words(name):
+        weighted[word] = FILE_NAME_WEIGHT
+    for folder in reversed(folders[-FOLDER_DEPTH:]):
+        for word in words(folder):
+            weighted.setdefault(word, FOLDER_WEIGHT)
+    return list(weighted.items())
+
+class LinkSuggestionIndex:
+    """Ranks assignments by how well their name and description match a file path.
+
+    An inverted index maps each word to the assignments using it, and words
+    are scored by rarity (IDF), so "Lab 7" beats "Report" when both appear.
+    Words in the path that no assignment uses are matched to known words
+    by trigram overlap, which catches abbreviations and typos. Assignments
+    are added, changed and removed one at a time by sync(), so refreshing
+    the snapshot doesn't rebuild the index.
+    """
+    def __init__(self, records=()):
+        self._postings = {}
+        self._words = {}
+        self._fields = {}
+        self._word_trigrams = {}
+        self.sync(records)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def add(self, assignment, description=None):
+        self.remove(assignment)
+        weights = {}
+        for word in words(description):
+            weights[word] = DESCRIPTION_WEIGHT
+        for word in words(assignment):
+            weights[word] = NAME_WEIGHT
+        self._fields[assignment] = description
+        self._words[assignment] = weights
+        for word, weight in weights.items():
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = {}
+                for trigram in trigrams(word):
+                    self._word_trigrams.setdefault(trigram, set()).add(word)
+            postings[assignment] = weight
+
+    def remove(self, assignment):
+        weights = self._words.pop(assignment, None)
+        if weights is None:
+            return
+        del self._fields[assignment]
+        for word in weights:
+            postings = self._postings[word]
+            del postings[assignment]
+            if not postings:
+                del self._postings[word]
+                for trigram in trigrams(word):
+                    self._word_trigrams[trigram].discard(word)
+
+    def sync(self, records):
+        """Bring the index in line with (assignment, description) pairs, touching only changes"""
+        wanted = {}
+        for assignment, description in records:
+            if assignment not in ('', None):
+                wanted.setdefault(str(assignment), description)
+        for assignment in [assignment for assignment in self._fields if assignment not in wanted]:
+            self.remove(assignment)
+        for assignment, description in wanted.items():
+            if assignment not in self._fields or self._fields[assignment] != description:
+                self.add(assignment, description)
+
+    def _similar_words(self, word):
+        """Return (known word, similarity) pairs sharing most of word's trigrams"""
+        query = trigrams(word)
+        counts = {}
+        for trigram in query:
+            for known in self._word_trigrams.get(trigram, ()):
+                counts[known] = counts.get(known, 0) + 1
+        similar = []
+        for known, shared in counts.items():
+            score = shared / len(query | trigrams(known))
+            if score >= SIMILAR_WORD_MIN_SCORE:
+                similar.append((known, score))
+        return similar
+
+    def suggest(self, file_path, limit=DEFAULT_SUGGESTIONS):
+        """Return up to limit (assignment, score) pairs for file_path, best first"""
+        total = len(self._fields)
+        if not total:
+            return []
+        common = total * COMMON_WORD_SHARE if total >= COMMON_WORD_MIN_ROWS else total
+
+        terms = []
+        for word, weight in path_words(file_path):
+            if word in self._postings:
+                terms.append((word, weight))
+            elif len(word) >= 4:
+                terms.extend((known, weight * score) for known, score in self._similar_words(word))
+
+        scores = {}
+        common_terms = []
+        for word, weight in terms:
+            postings = self._postings[word]
+            if len(postings) > common:
+                common_terms.append((word, weight))
+                continue
+            idf = math.log(1 + total / len(postings))
+            for assignment, field_weight in postings.items():
+                scores[assignment] = scores.get(assignment, 0.0) + weight * idf * field_weight
+
+        # Common words only re-rank what rarer words found, unless nothing else matched
+        candidates = list(scores) if scores else None
+        for word, weight in common_terms:
+            postings = self._postings[word]
+            idf = math.log(1 + total / len(postings))
+            for assignment in (candidates if candidates is not None else postings):
+                field_weight = postings.get(assignment)
+                if field_weight:
+                    scores[assignment] = scores.get(assignment, 0.0) + weight * idf * field_weight
+
+        # Prefer the shorter name when scores tie; it matched more of itself
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -len(item[0])))
+        return [(assignment, round(score, 3)) for assignment, score in best]
@@ -1,15 +1,86 @@
-from SheetReader import SheetReader
+from detail_cache import DetailCache
+from file_links import FileLinkIndex, dropbox_relative_path
+from link_suggestions import LinkSuggestionIndex
+from sheet_errors import AssignmentNotFoundError, SheetUnavailableError
+from sheet_sources import load_cached_records
+from write_journal import WriteJournal
+import metrics
+import profiling
+import difflib
 import os
 import sys
+import threading
+import time
 
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
                            QWidget, QLabel, QPushButton, QTextEdit, QComboBox, 
                            QLineEdit, QRadioButton, QButtonGroup, QFrame, 
-                           QScrollArea, QMessageBox, QProgressBar, QSizePolicy, QDialog)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QEvent
+                           QScrollArea, QMessageBox, QProgressBar, QSizePolicy, QDialog,
+                           QCompleter, QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog)
+from PyQt5.QtCore import (Qt, QThread, QTimer, pyqtSignal, QEvent, QAbstractListModel,
+                          QModelIndex)
 from PyQt5.QtGui import QFont, QPalette, QColor
 from dotenv import load_dotenv
-from setup_wizard import run_setup_wizard
+from single_instance import InstanceServer, send_to_running_instance
+from search_index import DEFAULT_LIMIT as SEARCH_LIMIT, SearchIndex
+from tasks import TaskRunner
+
+# SheetReader (gspread, google-auth) and setup_wizard are imported where
+# they are first used, so the window can be shown before they load.
+
+# Set to 1 to print startup milestones for benchmarks/startup.py
+STARTUP_BENCHMARK = os.getenv("ASSIGNMENT_TRACKER_STARTUP_BENCHMARK") == "1"
+
+# Set to a file path to export metrics there every minute and on exit (.prom for Prometheus text, else JSON)
+METRICS_FILE = os.getenv("ASSIGNMENT_TRACKER_METRICS_FILE")
+METRICS_EXPORT_INTERVAL_MS = 60000
+
+# How often the open metrics panel redraws
+METRICS_REFRESH_MS = 2000
+
+# Quiet time after the last edit before changed fields are saved, so typing doesn't write per keystroke
+AUTOSAVE_DELAY_MS = 1500
+
+# Quiet time after the last keystroke before close misspellings are searched for as well
+FUZZY_SEARCH_DELAY_MS = 250
+
+# How long an assignment has to stay highlighted or top-ranked before its details are prefetched
+PREFETCH_DELAY_MS = 150
+
+# Wait before trying again to connect when Google couldn't be reached at launch
+RECONNECT_DELAY_MS = 30000
+
+# Seconds between checks for edits made by others; WATCH_INTERVAL in ~/.assignment_tracker/.env overrides it, 0 turns it off
+DEFAULT_WATCH_INTERVAL = 30
+
+# Sheet column behind each form field, for keeping cached records in step with saves
+DETAIL_COLUMNS = {'description': 'Description', 'due_date': 'Due Date', 'progress': 'Progress',
+                  'assignee': 'Assignee Name'}
+
+METRICS_COLUMNS = ["Operation", "Count", "Mean ms", "Max ms", "API calls", "KB in", "Cache hits", "Errors"]
+
+def watch_interval_ms():
+    """Return the configured change polling interval in milliseconds, 0 when polling is off"""
+    value = os.getenv("WATCH_INTERVAL", str(DEFAULT_WATCH_INTERVAL))
+    try:
+        return max(0, int(float(value) * 1000))
+    except ValueError:
+        print(f"Ignoring invalid WATCH_INTERVAL {value!r}")
+        return DEFAULT_WATCH_INTERVAL * 1000
+
+def find_renames(old_names, new_names):
+    """Pair names replaced in place between two versions of the list, as {old: new}"""
+    renames = {}
+    matcher = difflib.SequenceMatcher(None, old_names, new_names, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'replace' and i2 - i1 == j2 - j1:
+            renames.update(zip(old_names[i1:i2], new_names[j1:j2]))
+    return renames
+
+def report_startup_mark(name):
+    """Print a wall-clock startup milestone when benchmarking"""
+    if STARTUP_BENCHMARK:
+        print(f"startup-mark {name} {time.time():.6f}", flush=True)
 
 class FileOpenApplication(QApplication):
     """Custom QApplication that handles file open events on macOS"""
@@ -30,28 +101,159 @@ class FileOpenApplication(QApplication):
             return True
         return super().event(event)
 
-class LoadAssignmentsThread(QThread):
-    """Thread for loading assignments to prevent UI blocking"""
-    finished = pyqtSignal(list)
-    error = pyqtSignal(str)
+def connect_sheet_reader(credentials_path, sheet_id):
+    """Build the sheet reader; runs on the task pool while cached data is shown"""
+    from multi_sheet_reader import open_sheet_reader
+    # Revalidates the on-disk snapshots; only downloads worksheets that changed
+    return open_sheet_reader(credentials_path, sheet_id)
+
+class AssignmentListModel(QAbstractListModel):
+    """List of assignment names backing the dropdown and its search popup"""
+    # Beyond this many row changes a single reset is cheaper than per-row signals
+    RESET_THRESHOLD = 100
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.names = []
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
     
-    def __init__(self, sheet_reader):
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.EditRole):
+            return self.names[index.row()]
+        return None
+    
+    def set_names(self, names):
+        """Replace the list, emitting only row inserts and removals when the change is small"""
+        names = [str(name) for name in names]
+        wanted = set(names)
+        removed = [row for row, name in enumerate(self.names) if name not in wanted]
+        kept = [name for name in self.names if name in wanted]
+        kept_set = set(kept)
+        
+        if (len(removed) > self.RESET_THRESHOLD or len(names) - len(kept) > self.RESET_THRESHOLD
+                or kept != [name for name in names if name in kept_set]):
+            self.beginResetModel()
+            self.names = names
+            self.endResetModel()
+            return
+        
+        for row in reversed(removed):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.names[row]
+            self.endRemoveRows()
+        
+        for row, name in enumerate(names):
+            if row >= len(self.names) or self.names[row] != name:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self.names.insert(row, name)
+                self.endInsertRows()
+    
+    def append_names(self, names):
+        """Add a block of names at the end with a single insert"""
+        if not names:
+            return
+        first = len(self.names)
+        self.beginInsertRows(QModelIndex(), first, first + len(names) - 1)
+        self.names.extend(str(name) for name in names)
+        self.endInsertRows()
+
+class JournalReplayThread(QThread):
+    """Background worker that replays journaled saves to the spreadsheet"""
+    pending_changed = pyqtSignal(int)
+    replayed = pyqtSignal(dict)
+
+    MIN_RETRY_DELAY = 2
+    MAX_RETRY_DELAY = 120
+    IDLE_INTERVAL = 30
+
+    def __init__(self, journal, sheet_reader):
         super().__init__()
+        self.journal = journal
         self.sheet_reader = sheet_reader
-    
+        self._wake = threading.Event()
+        self._stopping = False
+
+    def wake(self):
+        """Replay now instead of waiting for the next interval"""
+        self._wake.set()
+
+    def stop(self):
+        self._stopping = True
+        self._wake.set()
+
     def run(self):
-        try:
-            assignments = self.sheet_reader.get_assignments()
-            self.finished.emit(assignments)
-        except Exception as e:
-            self.error.emit(str(e))
+        delay = self.MIN_RETRY_DELAY
+        while not self._stopping:
+            self._wake.clear()
+            try:
+                results = self.journal.replay(self.sheet_reader)
+                failed = False in results.values()
+                if results:
+                    self.replayed.emit(results)
+                self.pending_changed.emit(self.journal.pending_count())
+            except Exception as e:
+                print(f"Error replaying journal: {e}")
+                failed = True
+
+            if failed:
+                # Back off while the sheet is unreachable
+                wait = delay
+                delay = min(delay * 2, self.MAX_RETRY_DELAY)
+            else:
+                wait = self.IDLE_INTERVAL
+                delay = self.MIN_RETRY_DELAY
+            self._wake.wait(wait)
 
 class AssignmentTrackerApp(QMainWindow):
+    # New names beyond which the search index is rebuilt in the background
+    SEARCH_REBUILD_THRESHOLD = 1000
+    
     def __init__(self, file_path=None):
         super().__init__()
         self.file_path = file_path
         self.current_assignment = None
         self.is_updating = False
+        self.sheet_reader = None
+        self.replay_thread = None
+        self.cached_records = {}
+        self.cached_file_links = FileLinkIndex()
+        self.pending_link_path = None
+        self.link_suggestions = LinkSuggestionIndex()
+        self.loading_assignment = None
+        self.streaming_assignments = False
+        self.tasks = TaskRunner(parent=self)
+        # perf_counter start of UI operations that finish in a later callback
+        self.operation_started = {}
+        # Form values as last loaded or saved, to find the fields the user changed
+        self.saved_values = {}
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(AUTOSAVE_DELAY_MS)
+        self.autosave_timer.timeout.connect(self.autosave)
+        # Runs the slower misspelling search once typing pauses
+        self.fuzzy_search_timer = QTimer(self)
+        self.fuzzy_search_timer.setSingleShot(True)
+        self.fuzzy_search_timer.setInterval(FUZZY_SEARCH_DELAY_MS)
+        self.fuzzy_search_timer.timeout.connect(self.search_with_misspellings)
+        # Details of recently highlighted or opened assignments, so Load fills the form from memory
+        self.detail_cache = DetailCache()
+        self.prefetch_candidate = None
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(PREFETCH_DELAY_MS)
+        self.prefetch_timer.timeout.connect(self.prefetch_candidate_details)
+        # Polls for other people's edits once the assignment list has loaded
+        self.watch_timer = QTimer(self)
+        self.watch_timer.timeout.connect(self.poll_for_changes)
+        self.watch_failing = False
+        # Retries the connection while working offline
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.setInterval(RECONNECT_DELAY_MS)
+        self.reconnect_timer.timeout.connect(self.connect_clients)
+        self.connect_failing = False
         
         # Check for configuration first
         if not self.check_configuration():
@@ -61,29 +263,18 @@ class AssignmentTrackerApp(QMainWindow):
         self.setup_clients()
         self.apply_modern_styling()
         
+        if METRICS_FILE:
+            self.metrics_export_timer = QTimer(self)
+            self.metrics_export_timer.timeout.connect(self.export_metrics_file)
+            self.metrics_export_timer.start(METRICS_EXPORT_INTERVAL_MS)
+        
         # If a file path was provided during initialization, show it in status
         if self.file_path:
             self.open_file(self.file_path)
     
     def process_dropbox_path(self, file_path):
         """Extract the path after 'dropbox' (case insensitive)"""
-        if not file_path:
-            return file_path
-            
-        # Normalize the path and convert to lowercase for searching
-        normalized_path = file_path.lower()
-        
-        # Find 'dropbox' in the path (case insensitive)
-        dropbox_index = normalized_path.find('dropbox')
-        if dropbox_index != -1:
-            # Find the start of the path after 'dropbox'
-            # We need to find the next '/' after 'dropbox'
-            start_index = file_path.find('/', dropbox_index + len('dropbox'))
-            if start_index != -1:
-                return file_path[start_index:]
-        
-        # If 'dropbox' not found, return the original path
-        return file_path
+        return dropbox_relative_path(file_path)
     
     def check_configuration(self):
         """Check if configuration exists, run setup wizard if not"""
@@ -92,6 +283,7 @@ class AssignmentTrackerApp(QMainWindow):
         env_path = os.path.join(config_dir, ".env")
         
         if not os.path.exists(creds_path) or not os.path.exists(env_path):
+            from setup_wizard import run_setup_wizard
             if not run_setup_wizard():
                 QMessageBox.information(None, "Setup Required", 
                     "Setup is required to use Assignment Tracker.")
@@ -122,11 +314,38 @@ class AssignmentTrackerApp(QMainWindow):
         header_layout.addWidget(title_label)
         header_layout.addStretch()
         
-        if self.file_path:
-            file_label = QLabel(f"File: {os.path.basename(self.file_path)}")
-            file_label.setFont(QFont("Arial", 10))
-            file_label.setStyleSheet("color: #666;")
-            header_layout.addWidget(file_label)
+        # Names the file Save will link; updated when a later launch hands over another one
+        self.file_label = QLabel()
+        self.file_label.setFont(QFont("Arial", 10))
+        self.file_label.setStyleSheet("color: #666;")
+        self.file_label.setText(f"File: {os.path.basename(self.file_path)}" if self.file_path else "")
+        self.file_label.setVisible(bool(self.file_path))
+        header_layout.addWidget(self.file_label)
+        
+        # Saves waiting to reach the spreadsheet
+        self.pending_label = QLabel()
+        self.pending_label.setFont(QFont("Arial", 10))
+        self.pending_label.setStyleSheet("color: #e67e22;")
+        self.pending_label.setVisible(False)
+        header_layout.addWidget(self.pending_label)
+        
+        # Shows or hides the metrics panel
+        self.metrics_button = QPushButton("Metrics ▸")
+        self.metrics_button.setCheckable(True)
+        self.metrics_button.toggled.connect(self.toggle_metrics_panel)
+        self.metrics_button.setStyleSheet("""
+            QPushButton {
+                background-color: #6c757d;
+                color: white;
+                padding: 8px 16px;
+                border-radius: 4px;
+                font-size: 11px;
+            }
+            QPushButton:hover {
+                background-color: #5a6268;
+            }
+        """)
+        header_layout.addWidget(self.metrics_button)
         
         # Add settings button
         settings_button = QPushButton("Settings")
@@ -156,8 +375,22 @@ class AssignmentTrackerApp(QMainWindow):
         dropdown_layout = QHBoxLayout()
         self.assignment_dropdown = QComboBox()
         self.assignment_dropdown.setEditable(True)
+        self.assignment_model = AssignmentListModel(self)
+        self.assignment_dropdown.setModel(self.assignment_model)
+        self.assignment_dropdown.view().setUniformItemSizes(True)
         self.assignment_dropdown.setPlaceholderText("Search or select an assignment...")
         self.assignment_dropdown.currentTextChanged.connect(self.on_assignment_changed)
+        self.assignment_dropdown.highlighted[int].connect(self.on_dropdown_highlighted)
+        
+        # Type-ahead: the popup shows ranked matches from the search index
+        self.search_index = SearchIndex()
+        self.search_results = AssignmentListModel(self)
+        self.completer = QCompleter(self.search_results, self)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.assignment_dropdown.setCompleter(self.completer)
+        self.assignment_dropdown.lineEdit().textEdited.connect(self.on_search_text_edited)
+        self.completer.highlighted[str].connect(self.schedule_prefetch)
         
         self.search_button = QPushButton("Load Assignment")
         self.search_button.clicked.connect(self.load_assignment_details)
@@ -185,10 +418,22 @@ class AssignmentTrackerApp(QMainWindow):
         self.loading_bar.setVisible(False)
         main_layout.addWidget(self.loading_bar)
         
-        # Assignment details section
+        # Likely assignments for an opened file that isn't linked yet
+        self.suggestions_frame = QFrame()
+        self.suggestions_layout = QVBoxLayout()
+        self.suggestions_layout.setContentsMargins(0, 0, 0, 0)
+        suggestions_label = QLabel("Suggested assignments for this file:")
+        suggestions_label.setFont(QFont("Arial", 10, QFont.Bold))
+        self.suggestions_layout.addWidget(suggestions_label)
+        self.suggestions_frame.setLayout(self.suggestions_layout)
+        self.suggestions_frame.setVisible(False)
+        self.suggestion_buttons = []
+        main_layout.addWidget(self.suggestions_frame)
+        
+        # Assignment details section, filled in by ensure_details_section on first use
         self.details_frame = QFrame()
         self.details_frame.setVisible(False)
-        self.setup_details_section()
+        self.details_built = False
         main_layout.addWidget(self.details_frame)
         
         # Status section
@@ -197,8 +442,20 @@ class AssignmentTrackerApp(QMainWindow):
         self.status_text.setPlaceholderText("Status updates will appear here...")
         main_layout.addWidget(self.status_text)
         
+        # Operation metrics, filled in by ensure_metrics_section when first opened
+        self.metrics_frame = QFrame()
+        self.metrics_frame.setVisible(False)
+        self.metrics_built = False
+        main_layout.addWidget(self.metrics_frame)
+        
         central_widget.setLayout(main_layout)
     
+    def ensure_details_section(self):
+        """Build the details form the first time an assignment is loaded"""
+        if not self.details_built:
+            self.setup_details_section()
+            self.details_built = True
+    
     def setup_details_section(self):
         details_layout = QVBoxLayout()
         
@@ -259,6 +516,12 @@ class AssignmentTrackerApp(QMainWindow):
         self.assignee_field.setPlaceholderText("Enter assignee name...")
         form_layout.addWidget(self.assignee_field)
         
+        # Edits are saved once the user pauses, not per keystroke
+        self.description_field.textChanged.connect(self.on_form_edited)
+        self.due_date_field.textEdited.connect(self.on_form_edited)
+        self.assignee_field.textEdited.connect(self.on_form_edited)
+        self.progress_group.buttonClicked.connect(self.on_form_edited)
+        
         # Save button
         form_layout.addWidget(QLabel())  # Add some spacing
         self.save_button = QPushButton("Save Assignment")
@@ -272,6 +535,107 @@ class AssignmentTrackerApp(QMainWindow):
         
         self.details_frame.setLayout(details_layout)
     
+    def ensure_metrics_section(self):
+        """Build the metrics panel the first time it is opened"""
+        if not self.metrics_built:
+            self.setup_metrics_section()
+            self.metrics_built = True
+    
+    def setup_metrics_section(self):
+        metrics_layout = QVBoxLayout()
+        metrics_layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.metrics_table = QTableWidget(0, len(METRICS_COLUMNS))
+        self.metrics_table.setHorizontalHeaderLabels(METRICS_COLUMNS)
+        self.metrics_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.metrics_table.verticalHeader().setVisible(False)
+        self.metrics_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.metrics_table.setMinimumHeight(160)
+        metrics_layout.addWidget(self.metrics_table)
+        
+        buttons_layout = QHBoxLayout()
+        self.metrics_summary = QLabel()
+        self.metrics_summary.setFont(QFont("Arial", 10))
+        self.metrics_summary.setStyleSheet("color: #666;")
+        buttons_layout.addWidget(self.metrics_summary)
+        buttons_layout.addStretch()
+        export_button = QPushButton("Export...")
+        export_button.clicked.connect(self.export_metrics)
+        buttons_layout.addWidget(export_button)
+        metrics_layout.addLayout(buttons_layout)
+        
+        self.metrics_frame.setLayout(metrics_layout)
+        
+        # Redraws only while the panel is open
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.refresh_metrics_panel)
+    
+    def toggle_metrics_panel(self, shown):
+        """Show or hide the metrics panel"""
+        self.metrics_button.setText("Metrics ▾" if shown else "Metrics ▸")
+        if shown:
+            self.ensure_metrics_section()
+            self.refresh_metrics_panel()
+            self.metrics_timer.start(METRICS_REFRESH_MS)
+        elif self.metrics_built:
+            self.metrics_timer.stop()
+        self.metrics_frame.setVisible(shown)
+    
+    def refresh_metrics_panel(self):
+        """Redraw the metrics table from the registry"""
+        snapshot = metrics.registry.snapshot()
+        operations = snapshot['operations']
+        self.metrics_table.setRowCount(len(operations))
+        for row, (name, stats) in enumerate(operations.items()):
+            lookups = stats['cache_hits'] + stats['cache_misses']
+            cells = [
+                name,
+                str(stats['count']),
+                f"{stats['mean_ms']:.1f}",
+                f"{stats['max_ms']:.1f}",
+                str(stats['api_calls']),
+                f"{stats['bytes_received'] / 1024:.1f}",
+                f"{stats['cache_hits']}/{lookups}" if lookups else "",
+                str(stats['errors']),
+            ]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.metrics_table.setItem(row, column, item)
+        
+        api_calls = sum(snapshot['api_methods'].values())
+        methods = ", ".join(f"{method} {count}" for method, count in snapshot['api_methods'].items())
+        self.metrics_summary.setText(f"{api_calls} Google API calls" + (f" ({methods})" if methods else ""))
+    
+    def export_metrics(self):
+        """Save the current metrics to a file the user picks"""
+        path, _ = QFileDialog.getSaveFileName(self, "Export Metrics", "assignment-tracker-metrics.json",
+                                              "JSON (*.json);;Prometheus text (*.prom)")
+        if not path:
+            return
+        try:
+            metrics.registry.export(path)
+            self.status_text.append(f"Exported metrics to {path}")
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to export metrics:\n{str(e)}")
+    
+    def export_metrics_file(self):
+        """Write metrics to ASSIGNMENT_TRACKER_METRICS_FILE for an external collector"""
+        try:
+            metrics.registry.export(METRICS_FILE)
+        except OSError as e:
+            print(f"Error exporting metrics: {e}")
+    
+    def start_operation(self, name):
+        """Start timing a UI operation that finishes in a later callback"""
+        self.operation_started[name] = time.perf_counter()
+    
+    def finish_operation(self, name, failed=False):
+        started = self.operation_started.pop(name, None)
+        if started is not None:
+            metrics.observe(name, time.perf_counter() - started, failed)
+    
     def apply_modern_styling(self):
         self.setStyleSheet("""
             QMainWindow {
@@ -388,50 +752,298 @@ class AssignmentTrackerApp(QMainWindow):
         """)
     
     def setup_clients(self):
-        try:
-            self.status_text.append("Initializing clients...")
-            self.sheet_reader = SheetReader(self.credentials_path, os.getenv("SHEET_ID"))
-            self.status_text.append("Clients initialized successfully")
-            self.load_assignments()
-        except Exception as e:
-            self.status_text.append(f"Error initializing clients: {str(e)}")
+        """Show the last saved snapshot right away and connect in the background"""
+        sheet_id = os.getenv("SHEET_ID")
+        self.journal = WriteJournal()
+        self.on_pending_changed(self.journal.pending_count())
+        
+        records = load_cached_records(sheet_id)
+        if records:
+            self.cached_records = {record.get('Assignment'): record for record in records}
+            self.cached_file_links = FileLinkIndex.from_records(records)
+            self.refresh_link_suggestions([(record.get('Assignment'), record.get('Description'))
+                                           for record in records])
+            self.apply_assignment_list([record.get('Assignment') for record in records])
+            self.search_button.setEnabled(True)
+            self.status_text.append(f"Loaded {len(records)} assignments from local cache")
+            report_startup_mark("cached-list")
+        
+        self.status_text.append("Initializing clients...")
+        self.connect_clients()
+    
+    def connect_clients(self):
+        """Build the sheet reader on the task pool"""
+        self.start_operation('ui.connect')
+        self.tasks.submit('connect', connect_sheet_reader, self.credentials_path, os.getenv("SHEET_ID"),
+                          on_result=self.on_clients_ready, on_error=self.on_clients_error)
+    
+    def on_clients_ready(self, sheet_reader):
+        """Handle the spreadsheet connection becoming available"""
+        self.finish_operation('ui.connect')
+        self.sheet_reader = sheet_reader
+        self.cached_records = {}
+        self.status_text.append("Clients initialized successfully")
+        self.start_journal_replay()
+        self.load_assignments()
+    
+    def on_clients_error(self, error_msg):
+        """Keep working offline from the local cache and try connecting again later"""
+        self.finish_operation('ui.connect', failed=True)
+        self.reconnect_timer.start()
+        # Reported once, not on every retry while offline
+        if self.connect_failing:
+            return
+        self.connect_failing = True
+        self.status_text.append(f"Error initializing clients: {error_msg}")
+        if self.assignment_model.names:
+            self.status_text.append("Working offline from the local cache; saves will sync once connected")
+        else:
             QMessageBox.critical(self, "Configuration Error", 
-                f"Failed to initialize Google Sheets connection:\n{str(e)}\n\n"
-                "Please check your credentials and try again.")
-            sys.exit(1)
+                f"Failed to initialize Google Sheets connection:\n{error_msg}\n\n"
+                "Please check your credentials and your connection. Retrying in the background.")
+    
+    def start_journal_replay(self):
+        """Start replaying saves that are waiting in the local journal"""
+        self.replay_thread = JournalReplayThread(self.journal, self.sheet_reader)
+        self.replay_thread.pending_changed.connect(self.on_pending_changed)
+        self.replay_thread.replayed.connect(self.on_journal_replayed)
+        self.replay_thread.start()
+    
+    def on_pending_changed(self, count):
+        """Show how many saves have not reached the spreadsheet yet"""
+        self.pending_label.setText(f"{count} pending save{'s' if count != 1 else ''}")
+        self.pending_label.setVisible(count > 0)
+    
+    def on_journal_replayed(self, results):
+        """Report the outcome of a journal replay"""
+        for assignment, written in results.items():
+            if written:
+                self.status_text.append(f"Synced assignment: {assignment}")
+            elif written is None:
+                self.status_text.append(f"Could not sync '{assignment}': not found in spreadsheet, "
+                                        f"or listed more than once")
+        if False in results.values():
+            self.status_text.append("Spreadsheet unreachable, will retry pending saves")
     
     def load_assignments(self):
         """Load assignments in a separate thread"""
         self.loading_bar.setVisible(True)
-        self.loading_bar.setRange(0, 0)  # Indeterminate progress
+        self.loading_bar.setRange(0, 0)  # Indeterminate until the first block arrives
         self.status_text.append("Loading assignments from spreadsheet...")
         
-        self.assignment_thread = LoadAssignmentsThread(self.sheet_reader)
-        self.assignment_thread.finished.connect(self.on_assignments_loaded)
-        self.assignment_thread.error.connect(self.on_assignments_error)
-        self.assignment_thread.start()
+        # With nothing cached to show, blocks fill the dropdown as they arrive
+        self.streaming_assignments = not self.assignment_model.names
+        self.start_operation('ui.load_assignments')
+        self.tasks.submit_stream('assignments', self.sheet_reader.iter_assignment_chunks,
+                                 on_progress=self.on_assignment_chunk,
+                                 on_result=self.on_assignments_loaded, on_error=self.on_assignments_error)
+    
+    def on_assignment_chunk(self, chunk):
+        """Show download progress and append a streamed block of assignments"""
+        names, loaded, total = chunk
+        self.loading_bar.setRange(0, max(total, 1))
+        self.loading_bar.setValue(loaded)
+        if self.streaming_assignments and names:
+            self.assignment_model.append_names(names)
+            self.search_button.setEnabled(True)
     
     def on_assignments_loaded(self, assignments):
         """Handle successful assignment loading"""
         self.loading_bar.setVisible(False)
-        self.assignment_dropdown.clear()
-        self.assignment_dropdown.addItems(assignments)
+        # A fresh download may hold other people's edits, so prefetched details are refetched
+        self.detail_cache.clear()
+        self.apply_assignment_list(assignments)
+        self.finish_operation('ui.load_assignments')
         self.status_text.append(f"Loaded {len(assignments)} assignments")
         self.search_button.setEnabled(True)
+        self.start_watching()
+        report_startup_mark("interactive")
+        if STARTUP_BENCHMARK:
+            QApplication.instance().quit()
+        
+        # A file opened before any snapshot was available can be matched now
+        if self.pending_link_path:
+            file_path = self.pending_link_path
+            self.pending_link_path = None
+            self.select_linked_assignment(file_path)
+        
+        records = self.sheet_reader.records
+        if records is not None and 'Assignment' in records:
+            descriptions = records['Description'] if 'Description' in records else [None] * len(records)
+            self.refresh_link_suggestions(list(zip(records['Assignment'], descriptions)))
+    
+    def start_watching(self):
+        """Poll the spreadsheet for edits made elsewhere at the configured interval"""
+        interval = watch_interval_ms()
+        if interval and not self.watch_timer.isActive():
+            self.watch_timer.start(interval)
+    
+    def poll_for_changes(self):
+        """Check for a changed assignment list on the task pool; an unchanged sheet costs one metadata call"""
+        if self.sheet_reader is None or self.tasks.is_running('watch') or self.tasks.is_running('assignments'):
+            return
+        self.tasks.submit('watch', self.sheet_reader.poll_changes,
+                          on_result=self.on_assignments_changed, on_error=self.on_watch_error)
+    
+    def on_watch_error(self, error_msg):
+        """Report a failed change check once, not on every poll while offline"""
+        if not self.watch_failing:
+            self.status_text.append(f"Could not check for spreadsheet changes: {error_msg}")
+        self.watch_failing = True
+    
+    @metrics.timed('ui.apply_changes')
+    def on_assignments_changed(self, assignments):
+        """Apply inserts, deletes and renames made elsewhere, keeping the user's selection and text"""
+        self.watch_failing = False
+        if assignments is None:
+            return
+        # Cells of any row may have changed along with the list
+        self.detail_cache.clear()
+        
+        names = [str(name) for name in assignments]
+        old_names = list(self.assignment_model.names)
+        old_set = set(old_names)
+        new_set = set(names)
+        added = [name for name in names if name not in old_set]
+        removed = [name for name in old_names if name not in new_set]
+        if not added and not removed:
+            return
+        renames = find_renames(old_names, names) if added and removed else {}
+        
+        self.apply_assignment_list(names)
+        self.status_text.append(f"Spreadsheet changed: {len(added) - len(renames)} added, "
+                                f"{len(removed) - len(renames)} removed, {len(renames)} renamed")
+        
+        # The open assignment follows a rename so saves reach its row under the new name
+        current = self.current_assignment
+        if current in renames:
+            self.current_assignment = renames[current]
+            if self.assignment_dropdown.currentText().strip() == current:
+                self.assignment_dropdown.blockSignals(True)
+                self.assignment_dropdown.setCurrentText(self.current_assignment)
+                self.assignment_dropdown.blockSignals(False)
+            self.status_text.append(f"'{current}' was renamed to '{self.current_assignment}'")
+        elif current in removed:
+            self.status_text.append(f"'{current}' was removed from the spreadsheet")
+    
+    def refresh_link_suggestions(self, records):
+        """Bring the link suggestion index in line with (assignment, description) pairs"""
+        if not len(self.link_suggestions) and len(records) > self.SEARCH_REBUILD_THRESHOLD:
+            # A first build over a whole sheet runs on the task pool like the search index
+            self.tasks.submit('link-suggestions', LinkSuggestionIndex, records,
+                              on_result=self.on_link_suggestions_built)
+        else:
+            self.link_suggestions.sync(records)
+            self.update_link_suggestions()
+    
+    def on_link_suggestions_built(self, index):
+        """Swap in a link suggestion index built on the task pool"""
+        self.link_suggestions = index
+        self.update_link_suggestions()
+    
+    @metrics.timed('ui.link_suggestions')
+    def update_link_suggestions(self):
+        """Offer likely assignments for the opened file if it isn't linked to one yet"""
+        for button in self.suggestion_buttons:
+            self.suggestions_layout.removeWidget(button)
+            button.deleteLater()
+        self.suggestion_buttons = []
+        
+        suggestions = []
+        if self.file_path and self.linked_assignment(self.file_path) is None:
+            suggestions = self.link_suggestions.suggest(self.file_path)
+        
+        for assignment, _ in suggestions:
+            button = QPushButton(assignment)
+            button.setToolTip(f"Select '{assignment}' to link this file to it")
+            button.clicked.connect(lambda checked=False, name=assignment: self.choose_suggestion(name))
+            self.suggestions_layout.addWidget(button)
+            self.suggestion_buttons.append(button)
+        self.suggestions_frame.setVisible(bool(suggestions))
+    
+    def choose_suggestion(self, assignment):
+        """Select a suggested assignment and load it, ready to save the link"""
+        self.assignment_dropdown.setCurrentText(assignment)
+        self.load_assignment_details()
+    
+    @metrics.timed('ui.apply_assignment_list')
+    def apply_assignment_list(self, assignments):
+        """Update the dropdown and search index to match assignments, touching only the differences"""
+        dropdown = self.assignment_dropdown
+        current_text = dropdown.currentText()
+        # Intermediate edits shouldn't look like the user picking another assignment
+        dropdown.blockSignals(True)
+        self.assignment_model.set_names(assignments)
+        dropdown.setCurrentText(current_text)
+        dropdown.blockSignals(False)
+        
+        names = self.assignment_model.names
+        added = sum(1 for name in names if name not in self.search_index)
+        if added > self.SEARCH_REBUILD_THRESHOLD:
+            # Indexing a whole sheet takes long enough to build off the GUI thread
+            self.tasks.submit('search-index', SearchIndex, list(names),
+                              on_result=self.on_search_index_built)
+        else:
+            self.search_index.set_names(names)
+    
+    def on_search_index_built(self, index):
+        """Swap in a search index built on the task pool"""
+        index.set_names(self.assignment_model.names)
+        index.adopt_recent(self.search_index)
+        self.search_index = index
+    
+    @metrics.timed('ui.search')
+    def on_search_text_edited(self, text):
+        """Show ranked matches for what the user has typed so far"""
+        results = self.search_index.search(text, fuzzy=False)
+        self.show_search_results(text, results)
+        # Misspelling matches cost more per keystroke, so they wait until typing pauses
+        if text.strip() and len(results) < SEARCH_LIMIT:
+            self.fuzzy_search_timer.start()
+        else:
+            self.fuzzy_search_timer.stop()
+    
+    @metrics.timed('ui.fuzzy_search')
+    def search_with_misspellings(self):
+        """Add close misspellings to the matches once the user stops typing"""
+        text = self.assignment_dropdown.lineEdit().text()
+        self.show_search_results(text, self.search_index.search(text))
+    
+    def show_search_results(self, text, results):
+        self.search_results.set_names(results)
+        if text.strip():
+            self.completer.complete()
+            # The best match is the likeliest to be loaded next
+            self.schedule_prefetch(results[0] if results else None)
     
     def on_assignments_error(self, error_msg):
         """Handle assignment loading error"""
+        self.finish_operation('ui.load_assignments', failed=True)
         self.loading_bar.setVisible(False)
         self.status_text.append(f"Error loading assignments: {error_msg}")
+        if self.assignment_model.names:
+            # The saved list stays usable; the watcher picks up the sheet once it is reachable
+            self.status_text.append("Working offline from the local cache; saves will sync once connected")
+            self.start_watching()
+            return
         QMessageBox.critical(self, "Error", f"Failed to load assignments:\n{error_msg}")
     
     def on_assignment_changed(self):
         """Handle assignment dropdown change"""
         current_text = self.assignment_dropdown.currentText().strip()
         self.search_button.setEnabled(bool(current_text))
+        
+        # Picking a different assignment abandons the load in flight
+        if self.loading_assignment and current_text != self.loading_assignment:
+            self.tasks.cancel('details')
+            self.operation_started.pop('ui.load_details', None)
+            self.status_text.append(f"Cancelled loading: {self.loading_assignment}")
+            self.loading_assignment = None
+            self.loading_bar.setVisible(False)
     
     def clear_assignment(self):
         """Clear the current assignment and hide details"""
+        self.flush_autosave()
         self.assignment_dropdown.setCurrentText("")
         self.details_frame.setVisible(False)
         self.current_assignment = None
@@ -441,21 +1053,111 @@ class AssignmentTrackerApp(QMainWindow):
         self.status_text.setMaximumHeight(60)
         self.status_text.append("Cleared assignment selection")
     
+    @profiling.profiled('load-assignment-details')
     def load_assignment_details(self):
         """Load details for the selected assignment"""
         assignment = self.assignment_dropdown.currentText().strip()
         if not assignment:
             return
         
-        self.current_assignment = assignment
         self.status_text.append(f"Loading details for: {assignment}")
+        self.start_operation('ui.load_details')
         
+        # Until connected, details come straight from the on-disk snapshot
+        if self.sheet_reader is None:
+            record = self.cached_records.get(assignment)
+            self.show_assignment_details(assignment, record or {}, record is not None)
+            return
+        
+        self.loading_assignment = assignment
+        cached = self.cached_details(assignment)
+        if cached is not None:
+            self.show_assignment_details(assignment, *cached)
+            return
+        
+        self.loading_bar.setVisible(True)
+        self.loading_bar.setRange(0, 0)
+        self.tasks.submit('details', self.fetch_assignment_details, assignment,
+                          on_result=lambda result: self.on_details_loaded(assignment, result),
+                          on_error=self.on_details_error)
+    
+    @metrics.timed('ui.detail_cache')
+    def cached_details(self, assignment):
+        """Return (record, exists) from the detail cache, or None if it has to be fetched"""
+        cached = self.detail_cache.get(assignment)
+        metrics.record_cache(cached is not None)
+        return cached
+    
+    def on_details_loaded(self, assignment, result):
+        """Cache a fetched record and show it"""
+        self.detail_cache.put(assignment, *result)
+        self.show_assignment_details(assignment, *result)
+    
+    def on_dropdown_highlighted(self, row):
+        """Prefetch the assignment under the cursor in the dropdown list"""
+        names = self.assignment_model.names
+        self.schedule_prefetch(names[row] if 0 <= row < len(names) else None)
+    
+    def schedule_prefetch(self, assignment):
+        """Prefetch an assignment's details once it has been highlighted for a moment"""
+        self.prefetch_candidate = assignment
+        if assignment:
+            self.prefetch_timer.start()
+        else:
+            self.prefetch_timer.stop()
+    
+    def prefetch_candidate_details(self):
+        """Fetch the highlighted assignment's details on the task pool into the detail cache"""
+        assignment = self.prefetch_candidate
+        if self.sheet_reader is None or not assignment or assignment in self.detail_cache:
+            return
+        # Keyed per assignment so moving on doesn't throw away a fetch already under way
+        key = ('prefetch', assignment)
+        if self.tasks.is_running(key):
+            return
+        self.tasks.submit(key, self.fetch_assignment_details, assignment,
+                          on_result=lambda result: self.detail_cache.put(assignment, *result))
+    
+    @profiling.profiled('fetch-assignment-details')
+    def fetch_assignment_details(self, assignment):
+        """Look up a record and whether it exists; runs on the task pool"""
         try:
-            # Load assignment details
-            description = self.sheet_reader.get_description(assignment) or ""
-            due_date = self.sheet_reader.get_due_date(assignment) or ""
-            progress = self.sheet_reader.get_progress(assignment) or ""
-            assignee = self.sheet_reader.get_assignee(assignment) or ""
+            return self.sheet_reader.get_record(assignment), True
+        except AssignmentNotFoundError:
+            # A name that isn't in the sheet yet opens an empty form for a new assignment
+            return {}, False
+        except SheetUnavailableError:
+            # Offline, the row from the saved snapshot is better than nothing
+            record = self.sheet_reader.cached_record(assignment)
+            if record is None:
+                raise
+            return record, True
+    
+    def on_details_error(self, error_msg):
+        """Handle failure to load assignment details"""
+        self.finish_operation('ui.load_details', failed=True)
+        self.loading_assignment = None
+        self.loading_bar.setVisible(False)
+        self.status_text.append(f"Error loading assignment details: {error_msg}")
+        QMessageBox.critical(self, "Error", f"Failed to load assignment details:\n{error_msg}")
+    
+    def show_assignment_details(self, assignment, record, exists):
+        """Fill the details form with a loaded record"""
+        self.loading_assignment = None
+        self.loading_bar.setVisible(False)
+        # Edits to the assignment being replaced are saved before its form is overwritten
+        self.flush_autosave()
+        self.current_assignment = assignment
+        self.search_index.touch(assignment)
+        
+        try:
+            self.ensure_details_section()
+            
+            # Cells can hold numbers, so everything shown in a text field goes through str()
+            description = str(record.get('Description') or "")
+            due_date = str(record.get('Due Date') or "")
+            progress = str(record.get('Progress') or "")
+            assignee = str(record.get('Assignee Name') or "")
             
             # Populate fields
             self.description_field.setPlainText(description)
@@ -477,8 +1179,11 @@ class AssignmentTrackerApp(QMainWindow):
                 self.done_radio.setChecked(True)
             
             # Check if this is an update (assignment exists) or new assignment
-            existing_assignments = self.sheet_reader.get_assignments()
-            self.is_updating = assignment in existing_assignments
+            self.is_updating = exists
+            
+            # Filling the form is not an edit
+            self.autosave_timer.stop()
+            self.saved_values = dict(self.form_values(), file_path=str(record.get('File Path') or ""))
             
             # Show details section and resize window
             self.details_frame.setVisible(True)
@@ -487,11 +1192,74 @@ class AssignmentTrackerApp(QMainWindow):
             # Expand status area too
             self.status_text.setMaximumHeight(120)
             self.status_text.append(f"Loaded details for {assignment}")
+            self.finish_operation('ui.load_details')
             
         except Exception as e:
             self.status_text.append(f"Error loading assignment details: {str(e)}")
             QMessageBox.critical(self, "Error", f"Failed to load assignment details:\n{str(e)}")
     
+    def form_values(self):
+        """Return the details form as update_record keyword arguments"""
+        # Get progress from radio buttons
+        progress = ""
+        if self.not_started_radio.isChecked():
+            progress = "Not Started"
+        elif self.wip_radio.isChecked():
+            progress = "WIP"
+        elif self.done_radio.isChecked():
+            progress = "Done"
+        
+        return {
+            'description': self.description_field.toPlainText().strip(),
+            'due_date': self.due_date_field.text().strip(),
+            'progress': progress,
+            'assignee': self.assignee_field.text().strip(),
+        }
+    
+    def dirty_fields(self):
+        """Return the form fields that differ from what was last loaded or saved"""
+        # Empty fields keep the sheet's value when written, so clearing one isn't a change
+        return {field: value for field, value in self.form_values().items()
+                if value and value != self.saved_values.get(field)}
+    
+    def on_form_edited(self, *args):
+        """Restart the autosave countdown after an edit to an existing assignment"""
+        if self.current_assignment and self.is_updating:
+            self.autosave_timer.start()
+    
+    def flush_autosave(self):
+        """Save pending edits now instead of waiting for the countdown"""
+        if self.autosave_timer.isActive():
+            self.autosave_timer.stop()
+            self.autosave()
+    
+    def autosave(self):
+        """Journal only the fields changed since the last save; nothing is sent if none were"""
+        changes = self.dirty_fields()
+        if not self.current_assignment or not changes:
+            return
+        try:
+            self.journal_save(None, changes)
+            self.status_text.append(f"Autosaved {', '.join(sorted(changes))} for {self.current_assignment}")
+        except Exception as e:
+            self.status_text.append(f"Failed to autosave assignment: {str(e)}")
+    
+    def journal_save(self, file_path, changes):
+        """Journal a save; the replay thread pushes it to the spreadsheet"""
+        self.journal.append(self.current_assignment, file_path, **changes)
+        self.saved_values.update(changes)
+        columns = {DETAIL_COLUMNS[field]: value for field, value in changes.items()}
+        if file_path is not None:
+            self.saved_values['file_path'] = file_path
+            columns['File Path'] = file_path
+        # Reopening the assignment from the cache should show what was just saved
+        self.detail_cache.update(self.current_assignment, columns)
+        if self.replay_thread is not None:
+            self.replay_thread.wake()
+        self.on_pending_changed(self.journal.pending_count())
+    
+    @metrics.timed('ui.save_assignment')
+    @profiling.profiled('save-assignment')
     def save_assignment(self):
         """Save the assignment data"""
         if not self.current_assignment:
@@ -503,36 +1271,25 @@ class AssignmentTrackerApp(QMainWindow):
             return
         
         try:
-            # Get form data
-            description = self.description_field.toPlainText().strip()
-            due_date = self.due_date_field.text().strip()
-            assignee = self.assignee_field.text().strip()
-            
-            # Get progress from radio buttons
-            progress = ""
-            if self.not_started_radio.isChecked():
-                progress = "Not Started"
-            elif self.wip_radio.isChecked():
-                progress = "WIP"
-            elif self.done_radio.isChecked():
-                progress = "Done"
-            
-            self.status_text.append(f"Saving assignment: {self.current_assignment}")
+            self.autosave_timer.stop()
+            changes = self.dirty_fields()
             
             # Process the file path to keep only everything after 'dropbox'
             processed_file_path = self.process_dropbox_path(self.file_path)
+            link_changed = processed_file_path != self.saved_values.get('file_path')
+            
+            if not changes and not link_changed:
+                self.status_text.append(f"No changes to save for {self.current_assignment}")
+                return
+            
+            self.status_text.append(f"Saving assignment: {self.current_assignment}")
             
-            # Update spreadsheet
-            self.sheet_reader.update_record(
-                assignment=self.current_assignment,
-                file_path=processed_file_path,
-                description=description,
-                due_date=due_date,
-                progress=progress,
-                assignee=assignee
-            )
-            
-            self.status_text.append(f"Successfully saved assignment: {self.current_assignment}")
+            # Only changed fields are journaled, so the sheet only receives those cells
+            self.journal_save(processed_file_path if link_changed else None, changes)
+            self.link_file(processed_file_path, self.current_assignment)
+            self.update_link_suggestions()
+            
+            self.status_text.append(f"Saved assignment locally, syncing to spreadsheet: {self.current_assignment}")
             QMessageBox.information(self, "Success", f"Assignment '{self.current_assignment}' saved successfully!")
             
         except Exception as e:
@@ -540,6 +1297,20 @@ class AssignmentTrackerApp(QMainWindow):
             self.status_text.append(f"{error_msg}")
             QMessageBox.critical(self, "Error", error_msg)
     
+    def closeEvent(self, event):
+        """Stop the replay thread; anything unsent stays in the journal for next launch"""
+        self.flush_autosave()
+        if self.replay_thread is not None:
+            self.replay_thread.stop()
+            # Cuts short retries that could otherwise run for CALL_TIMEOUT during an outage
+            self.sheet_reader.scheduler.close()
+            # Destroying a QThread that is still running aborts the process, so let it finish
+            self.hide()
+            self.replay_thread.wait()
+        if METRICS_FILE:
+            self.export_metrics_file()
+        super().closeEvent(event)
+    
     def open_settings(self):
         """Open settings dialog to reconfigure credentials"""
         reply = QMessageBox.question(self, "Reconfigure Settings", 
@@ -548,36 +1319,97 @@ class AssignmentTrackerApp(QMainWindow):
             QMessageBox.Yes | QMessageBox.No)
         
         if reply == QMessageBox.Yes:
+            from setup_wizard import run_setup_wizard
             if run_setup_wizard():
                 QMessageBox.information(self, "Settings Updated", 
                     "Settings updated successfully! Please restart the application for changes to take effect.")
                 sys.exit(0)
     
+    def on_instance_request(self, file_path):
+        """Handle a file handed over by a later launch of the app"""
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+        if file_path:
+            self.open_file(file_path)
+    
+    def linked_assignment(self, file_path):
+        """Return the assignment a file is linked to in the snapshot currently shown, or None"""
+        if self.sheet_reader is not None:
+            return self.sheet_reader.linked_assignment(file_path)
+        return self.cached_file_links.lookup(file_path)
+    
+    def link_file(self, file_path, assignment):
+        """Link a file in the snapshot currently shown; the reader's index is shared with background threads"""
+        if self.sheet_reader is not None:
+            self.sheet_reader.link_file(file_path, assignment)
+        else:
+            self.cached_file_links.link(file_path, assignment)
+    
+    def select_linked_assignment(self, file_path):
+        """Select and show the assignment a file is already linked to, from memory"""
+        assignment = self.linked_assignment(file_path)
+        if assignment is None:
+            return False
+        if self.sheet_reader is not None:
+            record = self.sheet_reader.cached_record(assignment)
+        else:
+            record = self.cached_records.get(assignment)
+        if record is None:
+            return False
+        
+        self.assignment_dropdown.blockSignals(True)
+        self.assignment_dropdown.setCurrentText(str(assignment))
+        self.assignment_dropdown.blockSignals(False)
+        self.search_button.setEnabled(True)
+        self.status_text.append(f"File is linked to assignment: {assignment}")
+        self.show_assignment_details(assignment, record, True)
+        return True
+    
     def open_file(self, file_path):
         """Handle opening a file with the application"""
         if file_path and os.path.exists(file_path):
             self.file_path = file_path
+            self.file_label.setText(f"File: {os.path.basename(file_path)}")
+            self.file_label.setVisible(True)
             print(f"Opened file: {file_path}")
             self.status_text.append(f"Opened file: {os.path.basename(file_path)}")
             
+            # A file that is already linked opens straight to its assignment
+            if self.select_linked_assignment(file_path):
+                return
+            if not self.assignment_model.names:
+                self.pending_link_path = file_path
+            self.update_link_suggestions()
+            
             # If there's an active assignment, ask if they want to associate the file
             if self.current_assignment:
                 reply = QMessageBox.question(self, "Associate File", 
                     f"Do you want to associate this file with the current assignment?\n\n"
                     f"File: {os.path.basename(file_path)}\n"
-                    f"Assignment: {self.current_assignment.get('Title', 'Unknown')}",
+                    f"Assignment: {self.current_assignment}",
                     QMessageBox.Yes | QMessageBox.No)
                 
                 if reply == QMessageBox.Yes:
-                    # Update the assignment with the processed file path (keeping only everything after dropbox)
-                    processed_file_path = self.process_dropbox_path(file_path)
-                    self.current_assignment['File Path'] = processed_file_path
+                    # save_assignment links self.file_path, set above, to the current assignment
                     self.save_assignment()
         else:
             print(f"File not found or invalid: {file_path}")
             self.status_text.append(f"Error: Could not open file {file_path}")
 
 def main():
+    if profiling.PROFILE_FLAG in sys.argv:
+        sys.argv.remove(profiling.PROFILE_FLAG)
+        profiling.enable()
+    # Profiled up to the first paint; the rest of startup is timed by the operations it runs
+    startup_profile = profiling.profile('startup').start()
+    
+    # Hand the file to an instance that is already running, if there is one
+    requested_path = os.path.abspath(sys.argv[1]) if len(sys.argv) > 1 else None
+    if send_to_running_instance(requested_path):
+        print("Passed request to running instance")
+        sys.exit(0)
+    
     app = FileOpenApplication(sys.argv)
     
     # Set application properties for better styling
@@ -597,6 +1429,13 @@ def main():
     window = AssignmentTrackerApp(file_path)
     app.main_window = window  # Store reference for file open events
     window.show()
+    QTimer.singleShot(0, lambda: report_startup_mark("first-paint"))
+    QTimer.singleShot(0, startup_profile.stop)
+    
+    # Become the instance that later launches hand their files to
+    instance_server = InstanceServer()
+    instance_server.file_requested.connect(window.on_instance_request)
+    instance_server.listen()
     
     # Handle file from file open event if it came after window creation
     if app.file_to_open and not file_path:
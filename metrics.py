@@ -0,0 +1,212 @@
+import functools
+import json
+import os
+import threading
+import time
+
+# Upper bounds, in seconds, of the operation duration histogram
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PROMETHEUS_PREFIX = "assignment_tracker"
+
+class OperationStats:
+    """Running totals for one named operation"""
+    __slots__ = ('count', 'errors', 'total_s', 'max_s', 'buckets', 'api_calls', 'bytes_sent', 'bytes_received',
+                 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.api_calls = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total_ms': round(self.total_s * 1000, 3),
+            'mean_ms': round(self.total_s * 1000 / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max_s * 1000, 3),
+            'api_calls': self.api_calls,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class MetricsRegistry:
+    """In-memory totals per operation, cheap enough to leave on.
+
+    operation() times a block and makes it the current operation of its
+    thread; API calls, bytes and cache hits recorded while it runs are
+    added to it and to every operation it is nested in. Everything is
+    plain counters behind one lock, so recording costs a few microseconds.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._operations = {}
+        self._api_methods = {}
+        self.started = time.time()
+
+    def _stats(self, name):
+        stats = self._operations.get(name)
+        if stats is None:
+            stats = self._operations[name] = OperationStats()
+        return stats
+
+    def _active(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _add(self, field, amount):
+        names = self._active()
+        if not names:
+            return
+        with self._lock:
+            for name in set(names):
+                stats = self._stats(name)
+                setattr(stats, field, getattr(stats, field) + amount)
+
+    def operation(self, name):
+        return _Operation(self, name)
+
+    def timed(self, name):
+        """Decorator form of operation()"""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.operation(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def observe(self, name, seconds, failed=False):
+        """Record one run of an operation timed elsewhere, such as a load spanning several callbacks"""
+        with self._lock:
+            stats = self._stats(name)
+            stats.count += 1
+            stats.total_s += seconds
+            stats.max_s = max(stats.max_s, seconds)
+            if failed:
+                stats.errors += 1
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    stats.buckets[i] += 1
+                    break
+
+    def record_api_call(self, method):
+        with self._lock:
+            self._api_methods[method] = self._api_methods.get(method, 0) + 1
+        self._add('api_calls', 1)
+
+    def record_bytes(self, sent, received):
+        self._add('bytes_sent', sent)
+        self._add('bytes_received', received)
+
+    def record_cache(self, hit):
+        self._add('cache_hits' if hit else 'cache_misses', 1)
+
+    def snapshot(self):
+        """Return all totals as plain data"""
+        with self._lock:
+            return {
+                'started': self.started,
+                'exported': time.time(),
+                'operations': {name: stats.to_dict() for name, stats in sorted(self._operations.items())},
+                'api_methods': dict(sorted(self._api_methods.items())),
+            }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """Render the totals in the Prometheus text exposition format"""
+        p = PROMETHEUS_PREFIX
+        lines = []
+        with self._lock:
+            operations = sorted(self._operations.items())
+            api_methods = sorted(self._api_methods.items())
+
+            lines.append(f"# HELP {p}_operation_duration_seconds Time spent in each operation.")
+            lines.append(f"# TYPE {p}_operation_duration_seconds histogram")
+            for name, stats in operations:
+                label = _label(name)
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS, stats.buckets):
+                    cumulative += count
+                    lines.append(f'{p}_operation_duration_seconds_bucket{{operation="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'{p}_operation_duration_seconds_bucket{{operation="{label}",le="+Inf"}} {stats.count}')
+                lines.append(f'{p}_operation_duration_seconds_sum{{operation="{label}"}} {stats.total_s:.6f}')
+                lines.append(f'{p}_operation_duration_seconds_count{{operation="{label}"}} {stats.count}')
+
+            counters = [
+                ('operation_errors_total', "Operations that raised.", lambda stats: [('', stats.errors)]),
+                ('operation_api_calls_total', "Google API calls made during each operation.",
+                 lambda stats: [('', stats.api_calls)]),
+                ('operation_bytes_total', "HTTP body bytes moved during each operation.",
+                 lambda stats: [(',direction="sent"', stats.bytes_sent),
+                                (',direction="received"', stats.bytes_received)]),
+                ('operation_cache_total', "Snapshot cache lookups during each operation.",
+                 lambda stats: [(',result="hit"', stats.cache_hits), (',result="miss"', stats.cache_misses)]),
+            ]
+            for metric, help_text, values in counters:
+                lines.append(f"# HELP {p}_{metric} {help_text}")
+                lines.append(f"# TYPE {p}_{metric} counter")
+                for name, stats in operations:
+                    for extra, value in values(stats):
+                        lines.append(f'{p}_{metric}{{operation="{_label(name)}"{extra}}} {value}')
+
+            lines.append(f"# HELP {p}_api_requests_total Google API calls by method.")
+            lines.append(f"# TYPE {p}_api_requests_total counter")
+            for method, count in api_methods:
+                lines.append(f'{p}_api_requests_total{{method="{_label(method)}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Write the totals to path, as Prometheus text for .prom/.txt files and JSON otherwise"""
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        # Scrapers reading the file never see it half-written
+        os.replace(temp_path, path)
+
+class _Operation:
+    __slots__ = ('registry', 'name', 'started')
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.registry._active().append(self.name)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self.started
+        self.registry._active().pop()
+        self.registry.observe(self.name, elapsed, exc_type is not None)
+        return False
+
+# The registry every module in the app records into
+registry = MetricsRegistry()
+
+operation = registry.operation
+timed = registry.timed
+observe = registry.observe
+record_api_call = registry.record_api_call
+record_bytes = registry.record_bytes
+record_cache = registry.record_cache
@@ -0,0 +1,318 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from concurrency import ReadWriteLock, SingleFlight
+from file_links import FileLinkIndex
+from google_session import authorized_client
+from request_scheduler import default_scheduler
+from SheetReader import SheetReader, BatchUpdate, DEFAULT_CACHE_TTL, STREAM_CHUNK_ROWS
+from record_store import RecordStore
+from sheet_errors import AssignmentNotFoundError, SheetError
+from sheet_sources import parse_sources, namespaced, unique_labels
+
+# Upper bound on worksheets fetched at once; keeps bursts inside the Sheets per-user quota
+MAX_FETCH_WORKERS = 8
+
+class MultiSheetReader:
+    """Reads several worksheets, from one or more spreadsheets, as a single sheet.
+
+    Each worksheet gets its own SheetReader (and so its own cache, index and
+    disk snapshot); they share one authorized client and are fetched
+    concurrently on a bounded thread pool, so a load takes about as long as
+    the slowest tab. Assignments are namespaced as "<label> / <name>", where
+    the label is the tab title or the spreadsheet title, and writes are
+    routed back to the worksheet and row they came from. Like SheetReader
+    it can be shared between threads: the merged view is swapped under a
+    reader/writer lock and concurrent refreshes share one pass.
+    """
+    def __init__(self, credentials_path, sources, cache_ttl=DEFAULT_CACHE_TTL, use_disk_cache=True,
+                 max_workers=MAX_FETCH_WORKERS, scheduler=None):
+        self.credentials_path = credentials_path
+        self.sources = sources
+        self.scheduler = scheduler or default_scheduler()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sources))))
+        self.client = None
+        spreadsheets = {}
+        try:
+            self.authenticate()
+            spreadsheet_ids = list(dict.fromkeys(source.spreadsheet_id for source in sources))
+            spreadsheets = dict(zip(spreadsheet_ids, self._map(
+                lambda spreadsheet_id: self.scheduler.call(self.client.open_by_key, spreadsheet_id),
+                spreadsheet_ids)))
+        except SheetError as e:
+            # Each worksheet starts from its disk snapshot and opens itself once Google is reachable
+            print(f"Connecting later, spreadsheet unavailable: {e}")
+        self.readers = self._map(
+            lambda source: SheetReader(credentials_path, source.spreadsheet_id, cache_ttl, use_disk_cache,
+                                       worksheet=source.worksheet, client=self.client,
+                                       spreadsheet=spreadsheets.get(source.spreadsheet_id),
+                                       scheduler=self.scheduler),
+            sources)
+        self.labels = unique_labels([reader.label for reader in self.readers])
+
+        self._lock = ReadWriteLock()
+        self._flights = SingleFlight()
+        self.records = None
+        self._index = {}
+        self.duplicates = set()
+        self.file_links = FileLinkIndex()
+        self._stores = None
+        self._polled_records = None
+        # Each worksheet revalidated its own snapshot; those without one are downloaded on first read
+        self._merge([reader.records for reader in self.readers])
+
+    def authenticate(self):
+        self.client = self.scheduler.call(authorized_client, self.credentials_path)
+
+    def _map(self, fn, items):
+        return list(self._pool.map(fn, items))
+
+    def has_snapshot(self):
+        return all(reader.has_snapshot() for reader in self.readers)
+
+    def invalidate(self):
+        for reader in self.readers:
+            reader.invalidate()
+        with self._lock.write():
+            self._stores = None
+
+    def refresh(self):
+        self.invalidate()
+        return self.get_records()
+
+    def get_records(self):
+        """Revalidate every worksheet in parallel and return the merged snapshot"""
+        return self._flights.do('records', self._get_records)
+
+    def _get_records(self):
+        self._map(lambda reader: reader.revalidate(), self.readers)
+        return self._merged()
+
+    def _merged(self):
+        """Return the merged snapshot, merging again only if a worksheet's snapshot was replaced"""
+        stores = [reader.records for reader in self.readers]
+        with self._lock.read():
+            current = self._stores is not None and all(store is seen for store, seen in zip(stores, self._stores))
+            if current:
+                return self.records
+        return self._merge(stores)
+
+    def poll_changes(self):
+        """Return the merged assignment list if any worksheet changed since the last poll, else None.
+
+        modifiedTime is read once per spreadsheet, not once per tab, and
+        shared by the worksheets in it.
+        """
+        return self._flights.do('poll', self._poll_changes)
+
+    def _poll_changes(self):
+        owners = {}
+        for reader in self.readers:
+            owners.setdefault(reader.spreadsheet_id, reader)
+        modified_times = dict(zip(owners, self._map(lambda reader: reader.get_modified_time(), owners.values())))
+        self._map(lambda reader: reader.poll_changes(modified_times[reader.spreadsheet_id]), self.readers)
+        merged = self._merged()
+        with self._lock.write():
+            if merged is self._polled_records:
+                return None
+            self._polled_records = merged
+        if 'Assignment' not in merged:
+            return []
+        return list(merged['Assignment'])
+
+    def iter_assignment_chunks(self, chunk_size=STREAM_CHUNK_ROWS):
+        """Stream every worksheet's assignment list at once, namespaced.
+
+        Worksheets are downloaded in parallel and their blocks are yielded
+        as (names, loaded, total) in arrival order, with loaded and total
+        summed over all worksheets. Returns the merged assignment list.
+        """
+        chunks = queue.Queue()
+        progress = {}
+
+        def drain(reader, label):
+            try:
+                for names, loaded, total in reader.iter_assignment_chunks(chunk_size):
+                    chunks.put((reader, [namespaced(label, name) for name in names], loaded, total))
+            finally:
+                chunks.put(None)
+
+        futures = [self._pool.submit(drain, reader, label) for reader, label in zip(self.readers, self.labels)]
+        remaining = len(futures)
+        while remaining:
+            chunk = chunks.get()
+            if chunk is None:
+                remaining -= 1
+                continue
+            reader, names, loaded, total = chunk
+            progress[reader] = (loaded, total)
+            yield (names, sum(done for done, _ in progress.values()),
+                   sum(size for _, size in progress.values()))
+        for future in futures:
+            future.result()
+        return self.get_assignments()
+
+    def _merge(self, stores):
+        columns = []
+        for store in stores:
+            for column in (store.columns if store is not None else []):
+                if column not in columns:
+                    columns.append(column)
+
+        merged = RecordStore(columns=columns)
+        index = {}
+        duplicates = set()
+        for reader, label, store in zip(self.readers, self.labels, stores):
+            if store is None:
+                continue
+            for assignment in reader.duplicates:
+                duplicates.add(namespaced(label, assignment))
+            for position in range(len(store)):
+                row = store.row(position)
+                name = namespaced(label, row.get('Assignment'))
+                index.setdefault(name, (reader, row.get('Assignment')))
+                row['Assignment'] = name
+                merged.append(row)
+
+        if 'File Path' in merged:
+            file_links = FileLinkIndex(merged['Assignment'], merged['File Path'])
+        else:
+            file_links = FileLinkIndex()
+        with self._lock.write():
+            self.records = merged
+            self._index = index
+            self.duplicates = duplicates
+            self.file_links = file_links
+            self._stores = stores
+        return merged
+
+    def _route(self, assignment):
+        """Return (reader, assignment name within that worksheet)"""
+        with self._lock.read():
+            if assignment not in self._index:
+                raise AssignmentNotFoundError(f"'{assignment}' not found in any worksheet")
+            return self._index[assignment]
+
+    def export_records(self):
+        """Return every merged row as a dict with every cell current"""
+        # Export needs every cell current, not just the Assignment column
+        self._map(lambda reader: reader.get_records(), self.readers)
+        records = self.get_records()
+        with self._lock.read():
+            return records.to_records()
+
+    def to_dataframe(self):
+        """Return the merged snapshot as a pandas DataFrame (needs the analytics extra)"""
+        # Export needs every cell current, not just the Assignment column
+        self._map(lambda reader: reader.get_records(), self.readers)
+        return self.get_records().to_dataframe()
+
+    def get_assignments(self):
+        records = self.get_records()
+        if 'Assignment' not in records:
+            return []
+        return list(records['Assignment'])
+
+    def has_assignment(self, assignment):
+        self.get_records()
+        with self._lock.read():
+            return assignment in self._index
+
+    def get_record(self, assignment):
+        self.get_records()
+        reader, name = self._route(assignment)
+        record = reader.get_record(name)
+        record['Assignment'] = assignment
+        return record
+
+    def cached_record(self, assignment):
+        """Return the snapshot row for an assignment without touching the network, or None"""
+        with self._lock.read():
+            if assignment not in self._index:
+                return None
+            reader, name = self._index[assignment]
+        record = reader.cached_record(name)
+        if record is not None:
+            record['Assignment'] = assignment
+        return record
+
+    def linked_assignment(self, file_path):
+        """Return the assignment a file is linked to in the merged snapshot, or None"""
+        with self._lock.read():
+            return self.file_links.lookup(file_path)
+
+    def link_file(self, file_path, assignment):
+        """Point a file at an assignment in the merged link index, ahead of the save that writes it"""
+        with self._lock.write():
+            self.file_links.link(file_path, assignment)
+
+    def _get_field(self, assignment, column):
+        return self.get_record(assignment).get(column)
+
+    def get_description(self, assignment):
+        return self._get_field(assignment, 'Description')
+
+    def get_due_date(self, assignment):
+        return self._get_field(assignment, 'Due Date')
+
+    def get_progress(self, assignment):
+        return self._get_field(assignment, 'Progress')
+
+    def get_assignee(self, assignment):
+        return self._get_field(assignment, 'Assignee Name')
+
+    def update_record(self, assignment, file_path, description=None, due_date=None, progress=None, assignee=None):
+        self.get_records()
+        reader, name = self._route(assignment)
+        reader.update_record(name, file_path, description, due_date, progress, assignee)
+        # The worksheet patched its own snapshot in place; rebuild the merged view next read
+        with self._lock.write():
+            self._stores = None
+
+    def update_records(self, updates):
+        """Route edits to their worksheets and write each worksheet's share as one batch"""
+        self.get_records()
+        results = {}
+        grouped = {}
+        for update in updates:
+            assignment = update.get('assignment')
+            try:
+                reader, name = self._route(assignment)
+            except AssignmentNotFoundError as e:
+                print(f"Error preparing record for {assignment}: {e}")
+                results[assignment] = False
+                continue
+            grouped.setdefault(reader, []).append((assignment, dict(update, assignment=name)))
+
+        def write(reader):
+            pairs = grouped[reader]
+            written = reader.update_records([update for _, update in pairs])
+            return {assignment: written.get(update['assignment'], False) for assignment, update in pairs}
+
+        for written in self._map(write, list(grouped)):
+            results.update(written)
+        with self._lock.write():
+            for update in updates:
+                # A file_path of None keeps the existing link
+                if results.get(update.get('assignment')) and update.get('file_path') is not None:
+                    self.file_links.link(update.get('file_path'), update.get('assignment'))
+            self._stores = None
+        return results
+
+    def batch(self):
+        """Collect update_record calls and flush them as one request per worksheet on exit"""
+        return BatchUpdate(self)
+
+def open_sheet_reader(credentials_path, sheet_config, **kwargs):
+    """Return a reader for the SHEET_ID setting.
+
+    A single source gets a plain SheetReader with un-namespaced assignment
+    names, exactly as before multi-sheet support; several get a
+    MultiSheetReader.
+    """
+    sources = parse_sources(sheet_config)
+    if not sources:
+        raise ValueError("No SHEET_ID configured")
+    if len(sources) == 1:
+        return SheetReader(credentials_path, sources[0].spreadsheet_id, worksheet=sources[0].worksheet, **kwargs)
+    return MultiSheetReader(credentials_path, sources, **kwargs)
@@ -0,0 +1,154 @@
+import functools
+import os
+import re
+import sys
+import threading
+import time
+
+# cProfile, pstats and tracemalloc are imported only once profiling is on, so startup doesn't pay for them.
+
+# Set to 1 (or pass --profile to main.py) to profile startup and each user operation
+PROFILE_ENV = "ASSIGNMENT_TRACKER_PROFILE"
+PROFILE_FLAG = "--profile"
+
+DEFAULT_PROFILE_DIR = os.path.expanduser("~/.assignment_tracker/profiles")
+
+# Oldest profiles are deleted once the directory grows past this
+MAX_PROFILE_DIR_BYTES = 50 * 1024 * 1024
+
+# Stack depth kept per allocation, and rows shown in each text report
+TRACEMALLOC_FRAMES = 10
+REPORT_ROWS = 30
+
+_enabled = False
+_profile_dir = DEFAULT_PROFILE_DIR
+# Up to Python 3.11 cProfile hooks each thread separately, so operations on different threads are
+# profiled side by side; from 3.12 it allows one profiler per process, so overlapping ones wait their turn
+_turn = threading.Lock() if sys.version_info >= (3, 12) else None
+# Set while this thread is being profiled; a nested operation is already inside the outer profile
+_thread = threading.local()
+
+def enable(profile_dir=DEFAULT_PROFILE_DIR):
+    """Turn profiling on for the rest of the process"""
+    global _enabled, _profile_dir
+    import tracemalloc
+    _profile_dir = profile_dir
+    os.makedirs(profile_dir, exist_ok=True)
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    _enabled = True
+    print(f"Profiling enabled, writing to {profile_dir}")
+
+def is_enabled():
+    return _enabled
+
+class Profile:
+    """Profiles one operation with cProfile and tracemalloc when profiling is on.
+
+    Use as a context manager, or call start() and stop() for an operation
+    that ends in a later callback. When profiling is off both are a flag
+    check. Each profiled run writes three files named after the operation
+    and start time: a pstats dump (.prof, for snakeviz or pstats), a
+    tracemalloc snapshot taken at the end (.tracemalloc) and a text report
+    of the slowest calls and the largest allocations made during the run.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.profiler = None
+
+    def start(self):
+        if not _enabled or getattr(_thread, 'profiling', False):
+            return self
+        if _turn is not None:
+            _turn.acquire()
+        _thread.profiling = True
+        import cProfile
+        import tracemalloc
+        self.started_at = time.time()
+        self.before = tracemalloc.take_snapshot()
+        self.started = time.perf_counter()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        return self
+
+    def stop(self, failed=False):
+        if self.profiler is None:
+            return
+        self.profiler.disable()
+        elapsed = time.perf_counter() - self.started
+        import tracemalloc
+        after = tracemalloc.take_snapshot()
+        profiler = self.profiler
+        self.profiler = None
+        _thread.profiling = False
+        if _turn is not None:
+            _turn.release()
+        try:
+            write_profile(self.name, self.started_at, elapsed, failed, profiler, self.before, after)
+            rotate(_profile_dir)
+        except OSError as e:
+            print(f"Error writing profile for {self.name}: {e}")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop(exc_type is not None)
+        return False
+
+def profile(name):
+    return Profile(name)
+
+def profiled(name):
+    """Decorator form of profile()"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with Profile(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def write_profile(name, started_at, elapsed, failed, profiler, before, after, profile_dir=None):
+    """Write the .prof, .tracemalloc and .txt files for one profiled run"""
+    import io
+    import pstats
+    profile_dir = profile_dir or _profile_dir
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(started_at)) + f"-{int(started_at * 1000) % 1000:03d}"
+    base = os.path.join(profile_dir, f"{stamp}-{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}")
+
+    profiler.dump_stats(f"{base}.prof")
+    after.dump(f"{base}.tracemalloc")
+
+    report = io.StringIO()
+    report.write(f"{name}: {elapsed * 1000:.1f} ms{' (failed)' if failed else ''}\n\n")
+    stats = pstats.Stats(profiler, stream=report)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_ROWS)
+    report.write("Largest allocations during the run:\n")
+    for diff in after.compare_to(before, 'lineno')[:REPORT_ROWS]:
+        report.write(f"  {diff}\n")
+    with open(f"{base}.txt", 'w', encoding='utf-8') as f:
+        f.write(report.getvalue())
+    return base
+
+def rotate(profile_dir, max_bytes=MAX_PROFILE_DIR_BYTES):
+    """Delete the oldest profile files until the directory fits in max_bytes"""
+    entries = []
+    for entry in os.scandir(profile_dir):
+        if entry.is_file():
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+if os.getenv(PROFILE_ENV) == "1":
+    enable()
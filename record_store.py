@@ -0,0 +1,72 @@
+import sys
+
+# Short strings (progress states, names, dates) repeat across rows; longer text rarely does
+INTERN_MAX_LENGTH = 64
+
+class RecordStore:
+    """Column-oriented snapshot of sheet rows.
+
+    Holds one list per column instead of a dict per row, and interns short
+    strings so repeated values like Progress or Assignee Name share a single
+    object. Stands in for the pandas DataFrame SheetReader used to build.
+    """
+    __slots__ = ('columns', '_data')
+
+    def __init__(self, records=(), columns=None):
+        records = list(records)
+        if columns is None:
+            columns = list(records[0].keys()) if records else []
+        self.columns = list(columns)
+        self._data = {column: [] for column in self.columns}
+        for record in records:
+            self.append(record)
+
+    @staticmethod
+    def _intern(value):
+        if isinstance(value, str) and len(value) <= INTERN_MAX_LENGTH:
+            return sys.intern(value)
+        return value
+
+    def __len__(self):
+        return len(self._data[self.columns[0]]) if self.columns else 0
+
+    def __getitem__(self, column):
+        """Return a column as a list, like DataFrame['column']"""
+        return self._data[column]
+
+    def __contains__(self, column):
+        return column in self._data
+
+    def append(self, record):
+        for column in self.columns:
+            self._data[column].append(self._intern(record.get(column, '')))
+
+    def row(self, position):
+        """Return one row as a dict keyed by column header"""
+        return {column: self._data[column][position] for column in self.columns}
+
+    def get(self, position, column, default=None):
+        if column not in self._data:
+            return default
+        return self._data[column][position]
+
+    def set(self, position, column, value):
+        if column in self._data:
+            self._data[column][position] = self._intern(value)
+
+    def to_records(self):
+        """Return rows as a list of dicts, the shape get_all_records() produces"""
+        return [self.row(position) for position in range(len(self))]
+
+    def to_dataframe(self):
+        """Return the snapshot as a pandas DataFrame for analytics export.
+
+        pandas is an optional extra (requirements-analytics.txt) and is only
+        imported here.
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("pandas is required for analytics export: "
+                              "pip3 install -r requirements-analytics.txt")
+        return pd.DataFrame({column: self._data[column] for column in self.columns}, columns=self.columns)
@@ -0,0 +1,222 @@
+import random
+import threading
+import time
+
+import requests
+import metrics
+from google.auth.exceptions import RefreshError, TransportError
+from gspread.exceptions import APIError, GSpreadException
+from sheet_errors import (CircuitOpenError, QuotaExceededError, RequestTimeoutError, SheetRequestError,
+                          SheetUnavailableError)
+
+# Sheets allows 60 read and 60 write requests per minute per user; the whole office shares one account
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_BURST = 10
+
+# Retries for 429/5xx/network failures, with jittered exponential backoff between them
+MAX_RETRIES = 5
+BASE_DELAY = 1.0
+MAX_DELAY = 32.0
+
+# Seconds one call may take overall, including waiting for budget and retries
+CALL_TIMEOUT = 90
+
+# Consecutive failed attempts that open the circuit, and how long it stays open
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30
+
+RETRYABLE_STATUSES = {408, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Spreads requests out to a per-minute budget, allowing short bursts"""
+    def __init__(self, per_minute=DEFAULT_REQUESTS_PER_MINUTE, burst=DEFAULT_BURST):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, deadline):
+        """Take one token, waiting for it if needed; False if it won't come before deadline"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def drain(self):
+        """Spend the remaining budget after a 429 so other threads back off too"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+class CircuitBreaker:
+    """Fails fast while Google is unhealthy.
+
+    After FAILURE_THRESHOLD consecutive failures the circuit opens and calls
+    are refused for RESET_TIMEOUT seconds. Then one trial call is let
+    through: success closes the circuit, failure opens it again.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def retry_in(self):
+        """Seconds until the next trial call is allowed"""
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def record_neutral(self):
+        """Forget a trial call whose outcome says nothing about Google's health"""
+        with self._lock:
+            self._probing = False
+
+def classify(error):
+    """Map a gspread/requests/google-auth exception to a SheetError, or None if it isn't one"""
+    if isinstance(error, APIError):
+        status = getattr(error, 'code', None) or getattr(error.response, 'status_code', None)
+        if status == 429:
+            return QuotaExceededError(f"Sheets quota exceeded: {error}")
+        if status in RETRYABLE_STATUSES:
+            return SheetUnavailableError(f"Google returned {status}: {error}")
+        return SheetRequestError(f"Google rejected the request ({status}): {error}", status)
+    if isinstance(error, requests.exceptions.Timeout):
+        return RequestTimeoutError(f"Request timed out: {error}")
+    if isinstance(error, (requests.exceptions.ConnectionError, TransportError)):
+        return SheetUnavailableError(f"Could not reach Google: {error}")
+    if isinstance(error, (RefreshError, GSpreadException)):
+        return SheetRequestError(str(error) or type(error).__name__)
+    return None
+
+def retry_after(error):
+    """Return the server's Retry-After in seconds, if it sent one"""
+    response = getattr(error, 'response', None)
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+class RequestScheduler:
+    """Runs every Sheets/Drive call under one budget, retry policy and circuit breaker.
+
+    call() waits for a token from the per-minute bucket, retries quota
+    (429) and server/network failures with jittered exponential backoff
+    within CALL_TIMEOUT, and raises a SheetError subclass when it gives up
+    instead of letting the caller mistake a failure for an empty result.
+    """
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, burst=DEFAULT_BURST,
+                 max_retries=MAX_RETRIES, base_delay=BASE_DELAY, max_delay=MAX_DELAY, call_timeout=CALL_TIMEOUT,
+                 breaker=None):
+        self.bucket = TokenBucket(requests_per_minute, burst)
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.call_timeout = call_timeout
+        self._closed = threading.Event()
+
+    def close(self):
+        """Refuse new calls and cut retries short, so threads inside call() return promptly at shutdown"""
+        self._closed.set()
+
+    def backoff(self, attempt):
+        """Delay before retry number attempt: exponential, with the upper half jittered"""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def call(self, fn, *args, **kwargs):
+        deadline = time.monotonic() + self.call_timeout
+        attempt = 0
+        while True:
+            if self._closed.is_set():
+                raise SheetUnavailableError("Shutting down")
+            if not self.bucket.acquire(deadline):
+                raise QuotaExceededError("Request budget exhausted; try again in a minute")
+            if not self.breaker.allow():
+                raise CircuitOpenError(
+                    f"Google Sheets is not responding; retrying in {self.breaker.retry_in():.0f}s")
+
+            metrics.record_api_call(getattr(fn, '__name__', type(fn).__name__))
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                error = classify(e)
+                if error is None or isinstance(error, SheetRequestError):
+                    self.breaker.record_neutral()
+                    if error is None:
+                        raise
+                    raise error from e
+                if isinstance(error, QuotaExceededError):
+                    self.breaker.record_neutral()
+                    self.bucket.drain()
+                else:
+                    self.breaker.record_failure()
+
+                attempt += 1
+                delay = retry_after(e) or self.backoff(attempt)
+                if attempt > self.max_retries:
+                    raise error from e
+                if time.monotonic() + delay > deadline:
+                    if isinstance(error, QuotaExceededError):
+                        raise error from e
+                    raise RequestTimeoutError(f"Gave up after {attempt} attempts: {error}") from e
+                print(f"Retrying in {delay:.1f}s after: {error}")
+                if self._closed.wait(delay):
+                    raise error from e
+                continue
+
+            self.breaker.record_success()
+            return result
+
+_default_scheduler = None
+_default_lock = threading.Lock()
+
+def default_scheduler():
+    """Return the scheduler shared by every SheetReader in this process"""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RequestScheduler()
+        return _default_scheduler
@@ -0,0 +1,222 @@
+import bisect
+import itertools
+import math
+import re
+import time
+
+DEFAULT_LIMIT = 50
+
+# Substring matches gathered per keystroke before ranking; keeps broad queries cheap
+MATCH_OVERSCAN = 4
+
+# Names scored per fuzzy lookup; candidates come from the rarest trigrams first
+FUZZY_MAX_CANDIDATES = 2000
+
+# Seconds a fuzzy lookup may spend scoring before it returns what it has
+FUZZY_TIME_BUDGET = 0.005
+
+# Minimum share of the query's trigrams a name needs to count as a fuzzy match
+FUZZY_MIN_SCORE = 0.5
+
+# Recently used names remembered for ranking
+RECENT_LIMIT = 200
+
+# Match tiers, best first
+PREFIX, WORD_START, SUBSTRING, FUZZY = range(4)
+
+WORD_BOUNDARY = re.compile(r"[\s_\-/.:()]+")
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SearchIndex:
+    """Case-insensitive type-ahead index over assignment names.
+
+    Combines a sorted list for prefix lookups with a trigram index for
+    substring and fuzzy matches. Names can be added and removed one at a
+    time, so refreshing the list doesn't rebuild the index. Results are
+    ranked by match quality, then by how recently the name was used.
+    """
+    def __init__(self, names=()):
+        self._names = []
+        self._lowered = []
+        self._ids = {}
+        self._sorted = []
+        self._trigrams = {}
+        self._recent = {}
+        self._clock = 0
+        self._last_query = None
+        self._last_matches = None
+        self.set_names(names)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def add(self, name, keep_sorted=True):
+        if name in self._ids:
+            return
+        lowered = name.lower()
+        name_id = len(self._names)
+        self._names.append(name)
+        self._lowered.append(lowered)
+        self._ids[name] = name_id
+        if keep_sorted:
+            bisect.insort(self._sorted, (lowered, name_id))
+        else:
+            self._sorted.append((lowered, name_id))
+        for trigram in trigrams(lowered):
+            self._trigrams.setdefault(trigram, set()).add(name_id)
+        self._last_query = None
+
+    def remove(self, name):
+        name_id = self._ids.pop(name, None)
+        if name_id is None:
+            return
+        lowered = self._lowered[name_id]
+        position = bisect.bisect_left(self._sorted, (lowered, name_id))
+        del self._sorted[position]
+        for trigram in trigrams(lowered):
+            self._trigrams[trigram].discard(name_id)
+        # Leave a tombstone so other ids stay valid
+        self._names[name_id] = None
+        self._lowered[name_id] = None
+        self._recent.pop(name, None)
+        self._last_query = None
+
+    def set_names(self, names):
+        """Bring the index in line with names, adding and removing only the differences"""
+        names = set(names)
+        for name in [name for name in self._ids if name not in names]:
+            self.remove(name)
+        added = [name for name in names if name not in self._ids]
+        # Sorting once beats an insort per name when loading a whole sheet
+        bulk = len(added) > 100
+        for name in added:
+            self.add(name, keep_sorted=not bulk)
+        if bulk:
+            self._sorted.sort()
+
+    def adopt_recent(self, other):
+        """Carry recency over from an index this one is replacing"""
+        self._recent = {name: used for name, used in other._recent.items() if name in self._ids}
+        self._clock = other._clock
+
+    def touch(self, name):
+        """Record that a name was just used, so it ranks higher"""
+        if name in self._ids:
+            self._clock += 1
+            self._recent.pop(name, None)
+            self._recent[name] = self._clock
+            if len(self._recent) > RECENT_LIMIT:
+                del self._recent[next(iter(self._recent))]
+
+    def _prefix_ids(self, query, limit):
+        ids = []
+        position = bisect.bisect_left(self._sorted, (query, -1))
+        while position < len(self._sorted) and len(ids) < limit:
+            lowered, name_id = self._sorted[position]
+            if not lowered.startswith(query):
+                break
+            ids.append(name_id)
+            position += 1
+        return ids
+
+    def _substring_candidates(self, query):
+        """Ids that could contain query, narrowed by trigrams when it is long enough"""
+        if len(query) < 3:
+            return self._ids.values()
+        inner = {query[i:i + 3] for i in range(len(query) - 2)}
+        postings = sorted((self._trigrams.get(trigram, set()) for trigram in inner), key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            candidates = candidates & posting
+            if not candidates:
+                break
+        return candidates
+
+    def _fuzzy_ids(self, query, exclude):
+        """Names sharing at least FUZZY_MIN_SCORE of the query's trigrams.
+
+        A name with enough shared trigrams can lack at most the rest, so it
+        must appear in one of the rarest len - needed + 1 posting lists.
+        Only those are read for candidates, up to FUZZY_MAX_CANDIDATES, and
+        each candidate is scored against every trigram, common ones included,
+        until FUZZY_TIME_BUDGET runs out.
+        """
+        query_trigrams = trigrams(query)
+        needed = math.ceil(FUZZY_MIN_SCORE * len(query_trigrams))
+        postings = sorted((self._trigrams.get(trigram, ()) for trigram in query_trigrams), key=len)
+        candidates = set()
+        for posting in postings[:len(postings) - needed + 1]:
+            candidates.update(itertools.islice(posting, FUZZY_MAX_CANDIDATES - len(candidates)))
+            if len(candidates) >= FUZZY_MAX_CANDIDATES:
+                break
+        scored = []
+        deadline = time.perf_counter() + FUZZY_TIME_BUDGET
+        for checked, name_id in enumerate(candidates):
+            if checked % 256 == 255 and time.perf_counter() > deadline:
+                break
+            if name_id in exclude:
+                continue
+            count = sum(1 for posting in postings if name_id in posting)
+            if count >= needed:
+                scored.append((name_id, count / len(query_trigrams)))
+        return scored
+
+    def _tier(self, lowered, query):
+        position = lowered.find(query)
+        if position == 0:
+            return PREFIX
+        if WORD_BOUNDARY.match(lowered[position - 1]):
+            return WORD_START
+        return SUBSTRING
+
+    def search(self, query, limit=DEFAULT_LIMIT, fuzzy=True):
+        """Return up to limit names matching query, best first; fuzzy=False skips misspelling matches"""
+        query = query.strip().lower()
+        if not query:
+            recent = sorted(self._recent, key=self._recent.get, reverse=True)[:limit]
+            if len(recent) < limit:
+                recent += [self._names[name_id] for _, name_id in self._sorted[:limit]
+                           if self._names[name_id] not in self._recent][:limit - len(recent)]
+            return recent
+
+        wanted = limit * MATCH_OVERSCAN
+        # Typing one more character can only narrow the previous complete match set
+        if (self._last_query and query.startswith(self._last_query)
+                and self._last_matches is not None and len(self._last_matches) < wanted):
+            candidates = self._last_matches
+        else:
+            candidates = None
+
+        # Recent names always make the cut, however many others match
+        matches = [self._ids[name] for name in self._recent if query in self._lowered[self._ids[name]]]
+        seen = set(matches)
+        for name_id in self._prefix_ids(query, wanted):
+            if name_id not in seen:
+                matches.append(name_id)
+                seen.add(name_id)
+        if candidates is None:
+            candidates = self._substring_candidates(query)
+        for name_id in candidates:
+            if len(matches) >= wanted:
+                break
+            if name_id not in seen and self._lowered[name_id] is not None and query in self._lowered[name_id]:
+                matches.append(name_id)
+                seen.add(name_id)
+
+        self._last_query = query
+        self._last_matches = matches if len(matches) < wanted else None
+
+        ranked = [(self._tier(self._lowered[name_id], query), -self._recent.get(self._names[name_id], 0), 0,
+                   len(self._lowered[name_id]), name_id) for name_id in matches]
+        if fuzzy and len(ranked) < limit and len(query) >= 3:
+            ranked += [(FUZZY, -self._recent.get(self._names[name_id], 0), -score,
+                        len(self._lowered[name_id]), name_id)
+                       for name_id, score in self._fuzzy_ids(query, seen)]
+        ranked.sort()
+        return [self._names[entry[-1]] for entry in ranked[:limit]]
@@ -293,6 +293,7 @@ class CredentialsSetupDialog(QDialog):
         
         self.sheet_id_input = QLineEdit()
         self.sheet_id_input.setPlaceholderText("Paste your Sheet ID here (found in the Google Sheets URL)")
+        self.sheet_id_input.setToolTip("Several sheets or tabs: separate with commas, add #Tab Name for a specific tab")
         self.sheet_id_input.setFont(QFont("Arial", 11))
         sheet_layout.addWidget(self.sheet_id_input)
         
@@ -415,11 +416,13 @@ class CredentialsSetupDialog(QDialog):
                         f.write(credentials_text)
                     
                     # Try to initialize SheetReader
-                    from SheetReader import SheetReader
-                    test_reader = SheetReader(temp_creds_path, sheet_id)
-                    
-                    # Try to get assignments (this will test the connection)
-                    assignments = test_reader.get_assignments()
+                    import profiling
+                    with profiling.profile('wizard-connection-test'):
+                        from multi_sheet_reader import open_sheet_reader
+                        test_reader = open_sheet_reader(temp_creds_path, sheet_id)
+                        
+                        # Try to get assignments (this will test the connection)
+                        assignments = test_reader.get_assignments()
                     
                     # Clean up temp file
                     os.remove(temp_creds_path)
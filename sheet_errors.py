@@ -0,0 +1,31 @@
+class SheetError(Exception):
+    """Base class for failures talking to the spreadsheet"""
+
+class SheetUnavailableError(SheetError):
+    """Google could not be reached, or kept failing after retries (network, timeout, 5xx)"""
+
+class RequestTimeoutError(SheetUnavailableError):
+    """A call did not finish within its time budget, retries included"""
+
+class CircuitOpenError(SheetUnavailableError):
+    """Calls are being refused without trying because Google has been failing"""
+
+class QuotaExceededError(SheetError):
+    """The Sheets per-minute quota stayed exhausted after retries (HTTP 429)"""
+
+class SheetRequestError(SheetError):
+    """Google rejected the request itself (4xx other than 429); retrying won't help"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+class AssignmentNotFoundError(SheetError, KeyError):
+    """The assignment name isn't in the sheet"""
+
+    def __str__(self):
+        # KeyError would quote the message again
+        return str(self.args[0]) if self.args else ""
+
+class DuplicateAssignmentError(SheetError, ValueError):
+    """The assignment name appears on more than one row, so edits would be ambiguous"""
@@ -0,0 +1,77 @@
+from snapshot_store import load_snapshot
+
+# Joins a worksheet's label and an assignment name when several worksheets are loaded
+NAMESPACE_SEPARATOR = " / "
+
+class SheetSource:
+    """One worksheet to read: a spreadsheet ID plus an optional tab title"""
+    __slots__ = ('spreadsheet_id', 'worksheet')
+
+    def __init__(self, spreadsheet_id, worksheet=None):
+        self.spreadsheet_id = spreadsheet_id
+        self.worksheet = worksheet
+
+    @property
+    def snapshot_key(self):
+        # The first tab keeps the plain spreadsheet ID so existing snapshots still load
+        if self.worksheet is None:
+            return self.spreadsheet_id
+        return f"{self.spreadsheet_id}#{self.worksheet}"
+
+    def __repr__(self):
+        return f"SheetSource({self.snapshot_key!r})"
+
+def parse_sources(sheet_config):
+    """Parse the SHEET_ID setting into SheetSources.
+
+    SHEET_ID holds one or more comma-separated entries, each a spreadsheet
+    ID optionally followed by '#' and a tab title:
+
+        SHEET_ID=1AbC...,1AbC...#Spring 2026,9XyZ...
+
+    An entry without a tab reads the spreadsheet's first worksheet.
+    """
+    sources = []
+    for entry in (sheet_config or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        spreadsheet_id, _, worksheet = entry.partition("#")
+        sources.append(SheetSource(spreadsheet_id.strip(), worksheet.strip() or None))
+    return sources
+
+def namespaced(label, assignment):
+    return f"{label}{NAMESPACE_SEPARATOR}{assignment}"
+
+def unique_labels(labels):
+    """Make labels distinct by numbering repeats, keeping their order"""
+    seen = {}
+    result = []
+    for label in labels:
+        count = seen.get(label, 0) + 1
+        seen[label] = count
+        result.append(label if count == 1 else f"{label} ({count})")
+    return result
+
+def load_cached_records(sheet_config):
+    """Return the on-disk snapshot rows for SHEET_ID, merged across sources.
+
+    With several sources, Assignment values are namespaced by each source's
+    label the same way MultiSheetReader names them. Returns None if no
+    source has a snapshot yet.
+    """
+    sources = parse_sources(sheet_config)
+    if len(sources) == 1:
+        records, _ = load_snapshot(sources[0].snapshot_key)
+        return records
+
+    loaded = [load_snapshot(source.snapshot_key, include_label=True) for source in sources]
+    if all(records is None for records, _, _ in loaded):
+        return None
+    labels = unique_labels([label or source.worksheet or source.spreadsheet_id
+                            for source, (_, _, label) in zip(sources, loaded)])
+    merged = []
+    for label, (records, _, _) in zip(labels, loaded):
+        for record in records or []:
+            merged.append(dict(record, Assignment=namespaced(label, record.get('Assignment'))))
+    return merged
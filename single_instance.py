@@ -0,0 +1,66 @@
+import getpass
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+# One endpoint per user so shared machines don't hand files to someone else's window
+SERVER_NAME = f"assignment-tracker-{getpass.getuser()}"
+
+CONNECT_TIMEOUT_MS = 300
+
+def send_to_running_instance(file_path, server_name=SERVER_NAME, timeout=CONNECT_TIMEOUT_MS):
+    """Hand a file path to an already running instance.
+
+    Returns True if another instance accepted it, in which case this
+    process can exit. An empty path just asks that instance to come forward.
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(server_name)
+    if not socket.waitForConnected(timeout):
+        return False
+    socket.write((file_path or "").encode('utf-8') + b"\n")
+    socket.flush()
+    socket.waitForBytesWritten(timeout)
+    socket.disconnectFromServer()
+    return True
+
+class InstanceServer(QObject):
+    """Local endpoint that receives file-open requests from later launches"""
+    file_requested = pyqtSignal(str)
+
+    def __init__(self, server_name=SERVER_NAME, parent=None):
+        super().__init__(parent)
+        self.server_name = server_name
+        self.server = QLocalServer(self)
+        self._buffers = {}
+        self.server.newConnection.connect(self._on_new_connection)
+
+    def listen(self):
+        if self.server.listen(self.server_name):
+            return True
+        # A crashed instance can leave its socket file behind
+        QLocalServer.removeServer(self.server_name)
+        if self.server.listen(self.server_name):
+            return True
+        print(f"Could not listen for other instances: {self.server.errorString()}")
+        return False
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self._buffers[socket] = b""
+            socket.readyRead.connect(lambda socket=socket: self._on_ready_read(socket))
+            socket.disconnected.connect(lambda socket=socket: self._on_disconnected(socket))
+
+    def _on_ready_read(self, socket):
+        buffer = self._buffers.get(socket, b"") + bytes(socket.readAll())
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            self.file_requested.emit(line.decode('utf-8'))
+        self._buffers[socket] = buffer
+
+    def _on_disconnected(self, socket):
+        # Pick up anything that arrived together with the disconnect
+        self._on_ready_read(socket)
+        self._buffers.pop(socket, None)
+        socket.deleteLater()
@@ -0,0 +1,55 @@
+import gzip
+import json
+import os
+
+DEFAULT_SNAPSHOT_DIR = os.path.expanduser("~/.assignment_tracker/snapshots")
+
+def snapshot_path(spreadsheet_id, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """Return the on-disk location of the snapshot for a spreadsheet"""
+    safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(spreadsheet_id))
+    return os.path.join(snapshot_dir, f"{safe_id}.json.gz")
+
+def save_snapshot(spreadsheet_id, records, modified_time=None, snapshot_dir=DEFAULT_SNAPSHOT_DIR, label=None):
+    """Write records to disk as gzipped header + row lists.
+
+    The file is written to a temporary name and renamed into place so a
+    crash never leaves a half-written snapshot behind.
+    """
+    header = list(records[0].keys()) if records else []
+    data = {
+        'modified_time': modified_time,
+        'label': label,
+        'header': header,
+        'rows': [[record.get(column) for column in header] for record in records],
+    }
+    path = snapshot_path(spreadsheet_id, snapshot_dir)
+    os.makedirs(snapshot_dir, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    try:
+        with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=5) as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(temp_path, path)
+    except Exception as e:
+        print(f"Error saving snapshot: {e}")
+
+def load_snapshot(spreadsheet_id, snapshot_dir=DEFAULT_SNAPSHOT_DIR, include_label=False):
+    """Return (records, modified_time) from disk, or (None, None) if there is none.
+
+    With include_label, the display label saved with the snapshot is
+    returned as a third item.
+    """
+    missing = (None, None, None) if include_label else (None, None)
+    path = snapshot_path(spreadsheet_id, snapshot_dir)
+    if not os.path.exists(path):
+        return missing
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        header = data['header']
+        records = [dict(zip(header, row)) for row in data['rows']]
+        if include_label:
+            return records, data.get('modified_time'), data.get('label')
+        return records, data.get('modified_time')
+    except Exception as e:
+        print(f"Error loading snapshot: {e}")
+        return missing
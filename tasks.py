@@ -0,0 +1,110 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class TaskSignals(QObject):
+    """Signals a Task uses to report back to the GUI thread"""
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    progress = pyqtSignal(object)
+
+class Task(QRunnable):
+    """Runs one callable on the thread pool"""
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+        self.cancelled = False
+
+    def cancel(self):
+        """Skip the call if it hasn't started and drop its result if it has"""
+        self.cancelled = True
+
+    def run(self):
+        if self.cancelled:
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.error.emit(str(e))
+            return
+        if not self.cancelled:
+            self.signals.finished.emit(result)
+
+class StreamTask(Task):
+    """Runs a generator function, reporting each item as progress.
+
+    The generator's return value is the task's result. Cancelling stops
+    the generator at its next item.
+    """
+    def run(self):
+        if self.cancelled:
+            return
+        try:
+            items = self.fn(*self.args, **self.kwargs)
+            while True:
+                try:
+                    item = next(items)
+                except StopIteration as stop:
+                    result = stop.value
+                    break
+                if self.cancelled:
+                    items.close()
+                    return
+                self.signals.progress.emit(item)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.error.emit(str(e))
+            return
+        if not self.cancelled:
+            self.signals.finished.emit(result)
+
+class TaskRunner(QObject):
+    """Runs SheetReader operations off the GUI thread.
+
+    Tasks are submitted under a key such as "details". A new task for a key
+    cancels the one before it, and a result is only delivered if it comes
+    from the latest task for its key, so answers arriving out of order are
+    ignored. Callbacks run on the GUI thread.
+    """
+    def __init__(self, pool=None, parent=None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._current = {}
+
+    def submit(self, key, fn, *args, on_result=None, on_error=None, **kwargs):
+        return self._start(key, Task(fn, *args, **kwargs), on_result, on_error)
+
+    def submit_stream(self, key, fn, *args, on_progress=None, on_result=None, on_error=None, **kwargs):
+        """Run a generator function, passing each item it yields to on_progress"""
+        task = StreamTask(fn, *args, **kwargs)
+        task.signals.progress.connect(lambda item: self._report(key, task, on_progress, item))
+        return self._start(key, task, on_result, on_error)
+
+    def _start(self, key, task, on_result, on_error):
+        self.cancel(key)
+        task.signals.finished.connect(lambda result: self._deliver(key, task, on_result, result))
+        task.signals.error.connect(lambda error: self._deliver(key, task, on_error, error))
+        self._current[key] = task
+        self.pool.start(task)
+        return task
+
+    def cancel(self, key):
+        task = self._current.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def is_running(self, key):
+        return key in self._current
+
+    def _report(self, key, task, callback, item):
+        if self._current.get(key) is task and callback is not None:
+            callback(item)
+
+    def _deliver(self, key, task, callback, value):
+        if self._current.get(key) is not task:
+            return
+        del self._current[key]
+        if callback is not None:
+            callback(value)
@@ -0,0 +1,148 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from sheet_errors import SheetError
+
+DEFAULT_JOURNAL_PATH = os.path.expanduser("~/.assignment_tracker/journal.db")
+
+# Fields an entry may carry, matching SheetReader.update_record's keyword arguments
+RECORD_FIELDS = ['file_path', 'description', 'due_date', 'progress', 'assignee']
+
+class WriteJournal:
+    """Durable local queue of assignment saves waiting to reach the sheet.
+
+    Saves are appended to a SQLite database in WAL mode and acknowledged
+    immediately; replay() later pushes them to the sheet in order.
+    """
+    def __init__(self, path=DEFAULT_JOURNAL_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    assignment TEXT NOT NULL,
+                    fields TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    error TEXT
+                )
+            """)
+            conn.commit()
+
+    def _connect(self):
+        # A connection per call keeps the journal usable from the GUI and replay threads
+        return sqlite3.connect(self.path, timeout=10)
+
+    def append(self, assignment, file_path, description=None, due_date=None, progress=None, assignee=None):
+        """Record a save and return its journal id"""
+        fields = {
+            'file_path': file_path,
+            'description': description,
+            'due_date': due_date,
+            'progress': progress,
+            'assignee': assignee,
+        }
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "INSERT INTO entries (assignment, fields, created) VALUES (?, ?, ?)",
+                (assignment, json.dumps(fields), time.time()))
+            conn.commit()
+            return cursor.lastrowid
+
+    def pending_count(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM entries WHERE status = 'pending'").fetchone()[0]
+
+    def failed_entries(self):
+        """Return (id, assignment, error) for saves that can never be applied"""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT id, assignment, error FROM entries WHERE status = 'failed' ORDER BY id").fetchall()
+
+    def pending(self):
+        """Return pending saves coalesced per assignment, in first-saved order.
+
+        Each item is (ids, update) where update holds update_record keyword
+        arguments. Later saves override earlier ones field by field; empty
+        fields fall through, just as update_record backfills them.
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, assignment, fields FROM entries WHERE status = 'pending' ORDER BY id").fetchall()
+
+        coalesced = {}
+        for entry_id, assignment, fields in rows:
+            ids, update = coalesced.setdefault(assignment, ([], {'assignment': assignment}))
+            ids.append(entry_id)
+            for field, value in json.loads(fields).items():
+                if value or field not in update:
+                    update[field] = value
+        return list(coalesced.values())
+
+    def _mark(self, ids, status=None, error=None):
+        placeholders = ", ".join("?" for _ in ids)
+        with closing(self._connect()) as conn:
+            if status == 'done':
+                conn.execute(f"DELETE FROM entries WHERE id IN ({placeholders})", ids)
+            elif status == 'failed':
+                conn.execute(f"UPDATE entries SET status = 'failed', error = ? WHERE id IN ({placeholders})",
+                             [error] + ids)
+            else:
+                conn.execute(f"UPDATE entries SET attempts = attempts + 1, error = ? WHERE id IN ({placeholders})",
+                             [error] + ids)
+            conn.commit()
+
+    def replay(self, sheet_reader):
+        """Push pending saves to the sheet as one batch.
+
+        Returns a dict mapping each assignment to True (written), False (kept
+        for retry) or None (dropped because the assignment is not in the
+        sheet, or is on more than one row so the write would be ambiguous).
+        """
+        pending = self.pending()
+        if not pending:
+            return {}
+
+        # Without a current list we can't tell a missing row from being offline
+        try:
+            sheet_reader.get_assignments()
+        except SheetError as e:
+            for ids, _ in pending:
+                self._mark(ids, error=f"Spreadsheet unavailable: {e}")
+            return {update['assignment']: False for _, update in pending}
+
+        results = {}
+        batch = []
+        for ids, update in pending:
+            if not sheet_reader.has_assignment(update['assignment']):
+                self._mark(ids, status='failed', error="Assignment not found in sheet")
+                results[update['assignment']] = None
+            elif update['assignment'] in sheet_reader.duplicates:
+                # update_records refuses ambiguous rows, so retrying would never succeed
+                self._mark(ids, status='failed', error="Assignment appears more than once in sheet")
+                results[update['assignment']] = None
+            else:
+                batch.append((ids, update))
+
+        try:
+            written = sheet_reader.update_records([update for _, update in batch]) if batch else {}
+            error = "Write failed"
+        except SheetError as e:
+            # Kept pending with the reason; quota and outages clear up on a later replay
+            written = {}
+            error = str(e)
+        for ids, update in batch:
+            assignment = update['assignment']
+            if written.get(assignment):
+                self._mark(ids, status='done')
+                results[assignment] = True
+            else:
+                self._mark(ids, error=error)
+                results[assignment] = False
+        return results